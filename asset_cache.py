@@ -0,0 +1,201 @@
+import os
+import mmap
+import json
+import struct
+import pygame
+from os.path import dirname, join
+from atlas import TextureAtlas
+
+# Pre-sliced, pre-scaled sprite frames and their collision masks, written by build_assets.py and
+# memory-mapped at runtime so the game can skip PNG decoding, slicing and scale2x.
+# Frames are packed into texture atlas pages, with identical frames stored once. Directional sheets
+# hold only their right-facing frames; SpriteCache mirrors the others when they are first needed.
+#
+# File layout (little-endian):
+#   header: magic, version, index length, padded to 16 bytes
+#   index:  JSON describing every page, sheet and terrain tile, padded to 16 bytes
+#           (frames are [page, x, y, width, height])
+#   data:   per page, its pixels in the index's pixel format (4 bytes per pixel),
+#           then its mask as one byte per pixel (1 = solid)
+ARCHIVE_PATH = join("assets", "__pycache__", "sprites.bin")
+ARCHIVE_MAGIC = b"GJSA"
+ARCHIVE_VERSION = 3
+HEADER = struct.Struct("<4sHI6x")
+
+# Function to get the (mtime, size) stamp of each source file, to tell when an entry is out of date
+def source_stamps(paths):
+    stamps = {}
+    for path in paths:
+        stat = os.stat(path)
+        stamps[path] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+# Function to pick the byte order that matches convert_alpha(), so frames blit without conversion
+def display_pixel_format():
+    masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+    for name in ("BGRA", "RGBA", "ARGB"):
+        if pygame.image.frombuffer(bytes(4), (1, 1), name).get_masks() == masks:
+            return name
+    return "RGBA"
+
+# Writes an archive: add sheets and tiles, then save()
+class ArchiveWriter:
+    def __init__(self, pixel_format=None):
+        self.pixel_format = pixel_format or display_pixel_format()
+        self.index = {"format": self.pixel_format, "pages": [], "sheets": {}, "tiles": {}}
+        self.atlas = TextureAtlas()
+        self.page_masks = {}  # Page -> mask covering the whole page
+        self.size = 0
+
+    # Pack frames into the atlas pages and draw their masks into the page masks; returns their index entries
+    def add_frames(self, surfaces, masks):
+        entries = []
+        for frame, mask in zip(self.atlas.pack(surfaces), masks):
+            page, x, y, width, height = entry = self.atlas.locate(frame)
+            page = self.atlas.pages[page]
+            page_mask = self.page_masks.get(page)
+            if page_mask is None:
+                page_mask = self.page_masks[page] = pygame.mask.Mask((page.width, page.height))
+            page_mask.draw(mask, (x, y))
+            entries.append(list(entry))
+        return entries
+
+    # Add a sliced sheet: {animation: frames} and {animation: masks}, as SpriteCache stores them
+    def add_sheet(self, key, sources, sprites, masks):
+        frames = self.add_frames([frame for name in sprites for frame in sprites[name]],
+                                 [mask for name in sprites for mask in masks[name]])
+        animations = {}
+        for name, animation in sprites.items():
+            animations[name], frames = frames[:len(animation)], frames[len(animation):]
+        self.index["sheets"][archive_key(key)] = {"sources": source_stamps(sources), "animations": animations}
+
+    # Add a terrain tile (image and mask) for a (size, sprite_x, sprite_y) material
+    def add_tile(self, key, sources, image, mask):
+        self.index["tiles"][archive_key(key)] = {"sources": source_stamps(sources),
+                                                 "frame": self.add_frames([image], [mask])[0]}
+
+    def save(self, path=ARCHIVE_PATH):
+        chunks = []
+        self.index["pages"] = []
+        for page in self.atlas.pages:
+            plane = self.page_masks[page].to_surface(setcolor=(1, 1, 1, 255), unsetcolor=(0, 0, 0, 255))
+            chunks.append(pygame.image.tobytes(page.surface, self.pixel_format))
+            chunks.append(pygame.image.tobytes(plane, "RGBA")[::4])  # Red channel: 1 where the mask is set
+            self.index["pages"].append([page.width, page.height])
+        self.size = sum(map(len, chunks))
+        index = json.dumps(self.index).encode()
+        index += b" " * (-len(index) % 16)
+        os.makedirs(dirname(path), exist_ok=True)
+        temp = path + ".tmp"
+        with open(temp, "wb") as file:
+            file.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(index)))
+            file.write(index)
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(temp, path)
+
+# Function to turn a cache key tuple into an index key
+def archive_key(key):
+    return "/".join(str(part) for part in key)
+
+# Read side: maps the archive once and wraps each page with frombuffer (no copy, no decoding);
+# frames are subsurfaces of their page. They share the read-only mapping, so they must never be drawn on.
+class SpriteArchive:
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self.index = None  # Loaded on first use; empty if there is no usable archive
+        self.view = None  # memoryview over the mapped data section
+        self.fresh = {}  # Index key -> whether its source files are unchanged since the build
+        self.pages = {}  # Page number -> (page surface, page mask), wrapped on first use
+        self.frames = {}  # (page, x, y, width, height) -> (image, mask), so shared frames stay shared
+
+    # Map the archive the first time it is needed
+    def open(self):
+        if self.index is not None:
+            return
+        self.index = {"sheets": {}, "tiles": {}}
+        try:
+            with open(self.path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return  # No archive built (or an empty file): everything loads from the PNGs
+        if len(data) < HEADER.size:
+            return
+        magic, version, index_length = HEADER.unpack_from(data)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            return  # Built by another version: rebuild with build_assets.py
+        self.index = json.loads(bytes(data[HEADER.size:HEADER.size + index_length]))
+        self.view = memoryview(data)[HEADER.size + index_length:]
+
+    # Look up an entry, provided its source files have not changed since the build
+    def entry(self, section, key):
+        self.open()
+        name = archive_key(key)
+        entry = self.index[section].get(name)
+        if entry is None:
+            return None
+        fresh = self.fresh.get(name)
+        if fresh is None:
+            try:
+                fresh = self.fresh[name] = source_stamps(entry["sources"]) == entry["sources"]
+            except OSError:
+                fresh = self.fresh[name] = False
+        return entry if fresh else None
+
+    # Wrap one page and rebuild its mask
+    def page(self, number):
+        page = self.pages.get(number)
+        if page is None:
+            offset = 0
+            for width, height in self.index["pages"][:number]:
+                offset += width * height * 5
+            width, height = self.index["pages"][number]
+            size = width * height * 4
+            image = pygame.image.frombuffer(self.view[offset:offset + size], (width, height), self.index["format"])
+            plane = pygame.image.frombytes(bytes(self.view[offset + size:offset + size + width * height]),
+                                           (width, height), "P")
+            plane.set_colorkey(0)
+            page = self.pages[number] = image, pygame.mask.from_surface(plane)
+        return page
+
+    # Get one frame, as a subsurface of its page, and its mask
+    def frame(self, page, x, y, width, height):
+        key = (page, x, y, width, height)
+        frame = self.frames.get(key)
+        if frame is None:
+            image, page_mask = self.page(page)
+            mask = pygame.mask.Mask((width, height))
+            mask.draw(page_mask, (-x, -y))  # Copy the frame's part of the page mask
+            frame = self.frames[key] = image.subsurface((x, y, width, height)), mask
+        return frame
+
+    # Get ({animation: frames}, {animation: masks}) for a sheet key, or None if it is not archived
+    def sheet(self, key):
+        entry = self.entry("sheets", key)
+        if entry is None:
+            return None
+        sprites, masks = {}, {}
+        for name, frames in entry["animations"].items():
+            pairs = [self.frame(*frame) for frame in frames]
+            sprites[name] = [image for image, _ in pairs]
+            masks[name] = [mask for _, mask in pairs]
+        return sprites, masks
+
+    # Get (image, mask) for a terrain tile key, or None if it is not archived
+    def tile(self, key):
+        entry = self.entry("tiles", key)
+        return None if entry is None else self.frame(*entry["frame"])
+
+    def has_sheet(self, key):
+        return self.entry("sheets", key) is not None
+
+    def has_tile(self, key):
+        return self.entry("tiles", key) is not None
+
+    # Report the pages and distinct frames wrapped so far
+    def stats(self):
+        return {"pages": len(self.pages), "unique": len(self.frames),
+                "page_bytes": sum(page.get_width() * page.get_height() * 4 for page, _ in self.pages.values())}
+
+
+SPRITE_ARCHIVE = SpriteArchive()
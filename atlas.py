@@ -0,0 +1,155 @@
+import hashlib
+import pygame
+
+PAGE_SIZE = 1024  # Width of every page, and the most rows a page grows to
+
+# One atlas surface, filled shelf by shelf from the top. A page stays open (it can still grow)
+# until its surface is allocated at the end of the pack() call that created it; after that only the
+# room left on its existing shelves is used.
+class AtlasPage:
+    def __init__(self, width, max_height):
+        self.width = width
+        self.height = max_height
+        self.shelves = []  # [y, height, used width]
+        self.surface = None
+        self.live = 0  # Frames handed out from this page and not released yet
+
+    # Reserve room for a width x height frame; returns its top-left corner, or None if it does not fit
+    def place(self, width, height):
+        best = None
+        for shelf in self.shelves:  # The lowest shelf the frame fits on wastes the least space
+            if height <= shelf[1] and shelf[2] + width <= self.width and (best is None or shelf[1] < best[1]):
+                best = shelf
+        if best is None:
+            top = self.shelves[-1][0] + self.shelves[-1][1] if self.shelves else 0
+            if self.surface is not None or width > self.width or top + height > self.height:
+                return None
+            best = [top, height, 0]
+            self.shelves.append(best)
+        x = best[2]
+        best[2] += width
+        return x, best[0]
+
+    # Create the surface, just big enough for the shelves placed so far
+    def allocate(self):
+        last = self.shelves[-1]
+        self.width = max(shelf[2] for shelf in self.shelves)
+        self.height = last[0] + last[1]
+        self.surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+
+# Packs sprite frames into a few large page surfaces and hands out subsurfaces of them. Frames with the
+# same size and pixels are stored once and shared; they are reference counted so pages can be freed.
+# Atlas frames share their page's pixels, so they must never be drawn on.
+class TextureAtlas:
+    def __init__(self, page_size=PAGE_SIZE):
+        self.page_size = page_size
+        self.pages = []
+        self.frames = {}  # Content key -> subsurface
+        self.slots = {}  # Content key -> page holding the frame
+        self.refs = {}  # Content key -> times handed out by pack() and not released
+        self.keys = {}  # id(subsurface) -> content key, to find a frame's entry from the frame
+        self.masks = {}  # (content key, scale2x) -> collision mask, built on first request
+
+    # Get the key identical frames share: their size and a hash of their pixels
+    def content_key(self, surface):
+        digest = hashlib.sha1(pygame.image.tobytes(surface, "RGBA")).digest()
+        return surface.get_size(), digest
+
+    # Copy frames into the atlas; returns the atlas frames in the same order. Frames already in the
+    # atlas are not copied again, and the new ones are placed tallest first so shelves fill evenly.
+    def pack(self, surfaces):
+        keys = [self.content_key(surface) for surface in surfaces]
+        new = {}
+        for key, surface in zip(keys, surfaces):
+            if key not in self.frames:
+                new.setdefault(key, surface)
+
+        placed = []
+        opened = []
+        for key, surface in sorted(new.items(), key=lambda item: -item[1].get_height()):
+            width, height = surface.get_size()
+            for page in self.pages + opened:
+                pos = page.place(width, height)
+                if pos is not None:
+                    break
+            else:
+                page = AtlasPage(max(self.page_size, width), max(self.page_size, height))
+                opened.append(page)
+                pos = page.place(width, height)
+            placed.append((key, surface, page, pos))
+
+        for page in opened:
+            page.allocate()
+            self.pages.append(page)
+        for key, surface, page, pos in placed:
+            page.surface.blit(surface, pos, special_flags=pygame.BLEND_RGBA_ADD)  # Exact copy onto the empty page
+            frame = self.frames[key] = page.surface.subsurface((pos, surface.get_size()))
+            self.slots[key] = page
+            self.keys[id(frame)] = key
+            self.refs[key] = 0
+
+        for key in keys:
+            self.refs[key] += 1
+            self.slots[key].live += 1
+        return [self.frames[key] for key in keys]
+
+    # Copy one frame into the atlas
+    def add(self, surface):
+        return self.pack([surface])[0]
+
+    # Get the collision mask of an atlas frame, built once per distinct frame. With scale2x, the mask is
+    # built from the frame scaled up with scale2x (for frames kept at half the size they collide at).
+    def mask(self, frame, scale2x=False):
+        key = self.keys.get(id(frame))
+        mask = self.masks.get((key, scale2x))
+        if mask is None:
+            mask = pygame.mask.from_surface(pygame.transform.scale2x(frame) if scale2x else frame)
+            if key is not None:  # Frames not from the atlas (e.g. from the sprite archive) are not cached
+                self.masks[(key, scale2x)] = mask
+        return mask
+
+    # Hand frames back, once per time pack() returned them; a page is freed when none of its frames
+    # are in use. Space freed inside a page that is still in use is not reused.
+    def release(self, frames):
+        for frame in frames:
+            key = self.keys.get(id(frame))
+            if key is None:
+                continue
+            page = self.slots[key]
+            page.live -= 1
+            self.refs[key] -= 1
+            if self.refs[key] == 0:
+                del self.frames[key], self.slots[key], self.refs[key], self.keys[id(frame)]
+                self.masks.pop((key, False), None)
+                self.masks.pop((key, True), None)
+            if page.live == 0:
+                self.pages.remove(page)
+
+    # Get (page index, x, y, width, height) of an atlas frame, or None if it is not in the atlas
+    def locate(self, frame):
+        key = self.keys.get(id(frame))
+        if key is None:
+            return None
+        return (self.pages.index(self.slots[key]), *frame.get_offset(), *frame.get_size())
+
+    # Drop every page and frame
+    def purge(self):
+        self.pages.clear()
+        self.frames.clear()
+        self.slots.clear()
+        self.refs.clear()
+        self.keys.clear()
+        self.masks.clear()
+
+    # Report frames handed out vs. stored and the bytes the pages take, for debugging and benchmarks
+    def stats(self):
+        return {
+            "frames": sum(self.refs.values()),
+            "unique": len(self.frames),
+            "pages": len(self.pages),
+            "page_bytes": sum(page.width * page.height * 4 for page in self.pages),
+            "frame_bytes": sum(width * height * 4 for (width, height), _ in self.frames),
+        }
+
+
+TEXTURE_ATLAS = TextureAtlas()
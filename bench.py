@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+from os.path import abspath, dirname, join
+from headless import load_game, parse_input
+from sprites import SPRITE_CACHE, TERRAIN_ATLAS
+from atlas import TEXTURE_ATLAS
+from asset_cache import SPRITE_ARCHIVE
+from render import RENDER_STATS
+from world import World
+
+SCENARIOS = ["Game_Jam_Fall24(1).py", "Game_Jam_Fall24(2).py", "Game_Jam_Fall24(3).py"]
+OBJECT_COUNTS = [0, 250, 1000, 4000]  # Extra blocks added to the level for the collision benchmark
+CAMERA_STEPS = 8  # Camera positions sampled across the level for the draw benchmark
+INPUT = "R:120 RJ:1 R:60 L:90 LJ:1 L:30 :60"  # Same default run as headless.py
+
+# Function to time fn over several runs and summarise the results in milliseconds
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"runs": repeat, "min_ms": min(times), "median_ms": statistics.median(times), "mean_ms": statistics.mean(times)}
+
+# Rebuild a level's world with extra blocks scattered off-grid above it, where the player never goes,
+# so the trajectory stays the same and only the cost of having more objects around changes
+def crowded_world(game, count, render):
+    world = game.build_world(render)
+    if not count:
+        return world
+    block_size = world.spatial_hash.cell_size
+    left = min(obj.rect.left for obj in world.objects)
+    right = max(obj.rect.right for obj in world.objects)
+    rng = random.Random(count)  # Same layout on every run
+    extra = [game.Block(rng.randrange(left, right), rng.randrange(-40 * block_size, -10 * block_size), block_size)
+             for _ in range(count)]
+    dynamic = set(map(id, world.dynamic_objects))
+    static_objects = [obj for obj in world.objects if id(obj) not in dynamic] + extra
+    return World(world.player, world.objects + extra, static_objects, block_size, world.fps, world.player_vel,
+                 world.hazards, (world.view_width, world.view_height), world.offset_x, world.scroll_area_width, render)
+
+# Benchmark one level script, drawing at native resolution if asked (see game.NATIVE_RESOLUTION)
+def bench_scenario(path, ticks, repeat, native=False):
+    SPRITE_CACHE.purge()  # Only this level's sheets are cached after it is built
+    TERRAIN_ATLAS.purge()
+    game = load_game(path)
+    sys.modules.get("game", game).NATIVE_RESOLUTION = native  # Set on the engine the level scripts share
+    game.build_world()
+    sheets = list(SPRITE_CACHE.sheets)
+    materials = list(TERRAIN_ATLAS.blocks)
+    # Atlas pages holding the level's frames: packed at runtime, or mapped from the sprite archive
+    results = {"atlas": {"runtime": TEXTURE_ATLAS.stats(), "archive": SPRITE_ARCHIVE.stats()}}
+
+    # Loading: sprite sheets and terrain blocks from disk (cold) and from the caches (warm)
+    def load_sheets_cold():
+        SPRITE_CACHE.purge()
+        for key in sheets:
+            game.load_sprite_sheets(*key)
+
+    def load_blocks_cold():
+        TERRAIN_ATLAS.purge()
+        for key in materials:
+            TERRAIN_ATLAS.get_block(*key)
+
+    results["load_sprite_sheets"] = {
+        "sheets": len(sheets),
+        "cold": measure(load_sheets_cold, repeat),
+        "warm": measure(lambda: [game.load_sprite_sheets(*key) for key in sheets], repeat),
+    }
+    results["get_block"] = {
+        "materials": len(materials),
+        "cold": measure(load_blocks_cold, repeat),
+        "warm": measure(lambda: [TERRAIN_ATLAS.get_block(*key) for key in materials], repeat),
+    }
+
+    # Level construction, with and without the render-side setup
+    results["build_world"] = {
+        "objects": len(game.build_world(False).objects),
+        "render": measure(lambda: game.build_world(True), repeat),
+        "headless": measure(lambda: game.build_world(False), repeat),
+    }
+
+    # Collision: the player's movement and collision pass for each tick of a scripted run
+    inputs = parse_input(INPUT)
+    collision = []
+    for count in OBJECT_COUNTS:
+        world = crowded_world(game, count, False)
+        handle_move = world.handle_move
+        samples = []
+
+        def timed_handle_move(buttons):
+            start = time.perf_counter()
+            handle_move(buttons)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        world.handle_move = timed_handle_move
+        start = time.perf_counter()
+        for tick in range(ticks):
+            world.step(inputs[tick % len(inputs)])
+        elapsed = time.perf_counter() - start
+        collision.append({
+            "extra_objects": count,
+            "objects": len(world.objects),
+            "ticks": ticks,
+            "handle_move_mean_ms": statistics.mean(samples),
+            "handle_move_max_ms": max(samples),
+            "step_mean_ms": elapsed * 1000 / ticks,
+        })
+    results["collision"] = collision
+    results["sprite_cache"] = SPRITE_CACHE.stats()  # Includes the mirrored frames the runs needed
+
+    # Rendering: full frames at camera positions spread across the level
+    world = game.build_world(True)
+    world.step(0)  # The player picks its first animation frame on the first tick
+    background = game.get_background("Blue.png")
+    left = min(obj.rect.left for obj in world.objects)
+    right = max(obj.rect.right for obj in world.objects) - world.view_width
+    draw = []
+    for i in range(CAMERA_STEPS):
+        offset_x = left + (right - left) * i // (CAMERA_STEPS - 1)
+        timing = measure(lambda: world.draw(game.window, background, offset_x), repeat)
+        timing.update(offset_x=offset_x, visible_objects=RENDER_STATS["drawn"], chunks=RENDER_STATS["chunks"])
+        draw.append(timing)
+    results["draw"] = draw
+    return results
+
+# Describe where the numbers came from so runs can be compared across commits
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=dirname(abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    import pygame
+    return {"commit": commit, "python": platform.python_version(), "pygame": pygame.version.ver,
+            "machine": platform.machine(), "system": platform.system()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time loading, collision, simulation and drawing for each level")
+    parser.add_argument("scenarios", nargs="*",
+                        default=[join(dirname(abspath(__file__)), name) for name in SCENARIOS], help="game scripts to benchmark (default: all levels)")
+    parser.add_argument("--ticks", type=int, default=600, help="simulation ticks per collision run")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per timed measurement")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--native", action="store_true", help="keep sprites at art size and draw to a half-size back buffer")
+    args = parser.parse_args()
+
+    output = abspath(args.output) if args.output else None  # Resolve before load_game changes directory
+    scenarios = [abspath(path) for path in args.scenarios]
+    report = {"environment": environment(), "native_resolution": args.native, "scenarios": {}}
+    for path in scenarios:
+        report["scenarios"][os.path.basename(path)] = bench_scenario(path, args.ticks, args.repeat, args.native)
+        print(f"benchmarked {os.path.basename(path)}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
@@ -0,0 +1,42 @@
+import os
+import time
+import argparse
+from os.path import abspath, dirname
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # The build needs a display format, not a window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(dirname(abspath(__file__)))  # Asset paths are relative to the game folder
+
+import game
+from asset_cache import ARCHIVE_PATH, ArchiveWriter
+from sprites import TERRAIN_ATLAS, build_masks, slice_sprite_sheets, sprite_sheet_paths
+
+# Slice, scale and mask every sprite sheet and terrain tile the levels use, and write them to one archive.
+# Run again after changing assets/ or the levels; entries whose PNGs changed are ignored until then.
+def build_archive(path=ARCHIVE_PATH):
+    sheets, tiles = [], []
+    for level in range(len(game.LEVELS)):
+        level_sheets, level_tiles = game.level_sprite_keys(level)
+        sheets += [key for key in level_sheets if key not in sheets]
+        tiles += [key for key in level_tiles if key not in tiles]
+
+    writer = ArchiveWriter()
+    for key in sheets:
+        sprites = slice_sprite_sheets(*key)  # Always from the PNGs, never from an older archive
+        writer.add_sheet(key, sprite_sheet_paths(*key[:2]), sprites, build_masks(sprites))
+    for key in tiles:
+        writer.add_tile(key, [TERRAIN_ATLAS.path], *TERRAIN_ATLAS.build_tile(*key))
+    writer.save(path)
+    return len(sheets), len(tiles), writer.atlas.stats(), writer.size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild sliced and scaled sprite frames and masks")
+    parser.add_argument("--output", default=ARCHIVE_PATH, help="archive to write")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sheets, tiles, atlas, size = build_archive(args.output)
+    print(f"{args.output}: {sheets} sheets, {tiles} tiles, {atlas['frames']} frames ({atlas['unique']} unique) "
+          f"on {atlas['pages']} pages, {size / 1024:.0f} KiB "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,316 @@
+import pygame
+
+# Uniform-grid spatial hash used as a broadphase before the per-pixel mask tests
+class SpatialHash:
+    def __init__(self, cell_size=96):
+        self.cell_size = cell_size  # Match the level's block size
+        self.cells = {}  # (cell_x, cell_y) -> objects overlapping that cell
+        self.buckets = {}  # object -> cells it is currently stored in
+        self.bounds = {}  # object -> rect (as a tuple) its cells were computed from
+        self.order = {}  # object -> insertion order, so queries keep the objects list order
+        self.count = 0
+
+    # Get every cell a rectangle overlaps
+    def cells_for(self, rect):
+        size = self.cell_size
+        x0, x1 = rect.left // size, (rect.right - 1) // size
+        y0, y1 = rect.top // size, (rect.bottom - 1) // size
+        return tuple((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    # Add an object under every cell its rect overlaps
+    def insert(self, obj):
+        if obj in self.buckets:
+            self.update(obj)
+            return
+        self.order[obj] = self.count
+        self.count += 1
+        cells = self.cells_for(obj.rect)
+        self.buckets[obj] = cells
+        self.bounds[obj] = tuple(obj.rect)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(obj)
+
+    # Add many objects at once (e.g. all static blocks at level load)
+    def insert_all(self, objects):
+        for obj in objects:
+            self.insert(obj)
+
+    # Remove an object from the hash
+    def remove(self, obj):
+        for cell in self.buckets.pop(obj, ()):
+            bucket = self.cells[cell]
+            bucket.remove(obj)
+            if not bucket:
+                del self.cells[cell]
+        self.order.pop(obj, None)
+        self.bounds.pop(obj, None)
+
+    # Re-bucket an object after it moved, touching only the cells that changed
+    def update(self, obj):
+        old_cells = self.buckets.get(obj)
+        if old_cells is None:
+            self.insert(obj)
+            return
+        bounds = tuple(obj.rect)
+        if bounds == self.bounds[obj]:
+            return  # Did not move
+        self.bounds[obj] = bounds
+        new_cells = self.cells_for(obj.rect)
+        if new_cells == old_cells:
+            return
+
+        for cell in old_cells:
+            if cell not in new_cells:
+                bucket = self.cells[cell]
+                bucket.remove(obj)
+                if not bucket:
+                    del self.cells[cell]
+        for cell in new_cells:
+            if cell not in old_cells:
+                self.cells.setdefault(cell, []).append(obj)
+        self.buckets[obj] = new_cells
+
+    # Get the objects whose cells overlap a rect (grown by margin on every side)
+    def query(self, rect, margin=0):
+        if margin:
+            rect = rect.inflate(margin * 2, margin * 2)
+        found = set()
+        for cell in self.cells_for(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return sorted(found, key=self.order.__getitem__)
+
+    def __len__(self):
+        return len(self.buckets)
+
+# Static collider standing in for a rectangle of merged tiles; the tiles are kept for rendering only
+class Collider(pygame.sprite.Sprite):
+    def __init__(self, rect, tiles, name=None):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+        self.tiles = tiles
+        self.name = name  # Same name as the tiles, so contacts are handled the same way
+        self.mask = pygame.Mask(self.rect.size)
+        for tile in tiles:
+            self.mask.draw(tile.mask, (tile.rect.x - self.rect.x, tile.rect.y - self.rect.y))
+
+# Greedy meshing: split {(cx, cy): kind} cells into maximal rectangles of one kind.
+# Returns (cx, cy, width, height) in cells.
+def greedy_rectangles(cells):
+    remaining = dict(cells)
+    rectangles = []
+    for cx, cy in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+        if (cx, cy) not in remaining:
+            continue
+        kind = remaining[(cx, cy)]
+
+        # Grow right along the row, then grow down while the whole row segment matches
+        width = 1
+        while (cx + width, cy) in remaining and remaining[(cx + width, cy)] == kind:
+            width += 1
+        height = 1
+        while all((x, cy + height) in remaining and remaining[(x, cy + height)] == kind
+                  for x in range(cx, cx + width)):
+            height += 1
+
+        for x in range(cx, cx + width):
+            for y in range(cy, cy + height):
+                del remaining[(x, y)]
+        rectangles.append((cx, cy, width, height))
+    return rectangles
+
+# Merge contiguous cell-sized static blocks into large colliders (blocks of other sizes pass through)
+def merge_static_blocks(blocks, cell_size):
+    groups = {}  # (x alignment, y alignment) -> {(cx, cy): blocks in that cell}
+    colliders = []
+    for block in blocks:
+        if block.rect.size != (cell_size, cell_size):
+            colliders.append(block)
+            continue
+        alignment = (block.rect.x % cell_size, block.rect.y % cell_size)
+        cell = (block.rect.x // cell_size, block.rect.y // cell_size)
+        groups.setdefault(alignment, {}).setdefault(cell, []).append(block)
+
+    for (origin_x, origin_y), cells in groups.items():
+        kinds = {cell: tiles[0].name for cell, tiles in cells.items()}
+        for cx, cy, width, height in greedy_rectangles(kinds):
+            tiles = [tile for x in range(cx, cx + width) for y in range(cy, cy + height) for tile in cells[(x, y)]]
+            rect = (cx * cell_size + origin_x, cy * cell_size + origin_y, width * cell_size, height * cell_size)
+            colliders.append(Collider(rect, tiles, kinds[(cx, cy)]))
+    return colliders
+
+# Tile flags stored in a TileGrid cell
+SOLID = 1
+GOAL = 4
+TILE_FLAGS = {"level_end": SOLID | GOAL}  # Block name -> flags; unnamed blocks are plain solids
+
+# Occupancy map of grid-aligned static blocks: one flags byte per cell, used as the static terrain
+# broadphase (a query reads only the cells a rect overlaps)
+class TileGrid:
+    def __init__(self, cell_size, origin_x, origin_y, left, top, cols, rows):
+        self.cell_size = cell_size
+        self.origin_x = origin_x  # Pixel offset of the grid lines (x % cell_size of the blocks)
+        self.origin_y = origin_y
+        self.left = left  # Cell coordinates of the first column/row
+        self.top = top
+        self.cols = cols
+        self.rows = rows
+        self.flags = bytearray(cols * rows)
+        self.colliders = {}  # Cell index -> merged collider covering it, used to report contacts
+
+    # Rasterise blocks that sit exactly on the grid; returns the grid and the blocks that do not
+    @classmethod
+    def compile(cls, blocks, cell_size):
+        sized = [block for block in blocks if block.rect.size == (cell_size, cell_size)]
+        if not sized:
+            return cls(cell_size, 0, 0, 0, 0, 0, 0), list(blocks)
+
+        # Use the alignment most of the blocks share
+        alignments = {}
+        for block in sized:
+            key = (block.rect.x % cell_size, block.rect.y % cell_size)
+            alignments[key] = alignments.get(key, 0) + 1
+        origin_x, origin_y = max(alignments, key=alignments.get)
+
+        on_grid, off_grid = [], []
+        for block in blocks:
+            aligned = (block.rect.size == (cell_size, cell_size) and block.rect.x % cell_size == origin_x
+                       and block.rect.y % cell_size == origin_y)
+            (on_grid if aligned else off_grid).append(block)
+
+        columns = [(block.rect.x - origin_x) // cell_size for block in on_grid]
+        rows = [(block.rect.y - origin_y) // cell_size for block in on_grid]
+        left, top = min(columns), min(rows)
+        grid = cls(cell_size, origin_x, origin_y, left, top, max(columns) - left + 1, max(rows) - top + 1)
+        cells = {}  # (column, row) -> blocks in that cell
+        for block, cx, cy in zip(on_grid, columns, rows):
+            grid.flags[(cy - top) * grid.cols + (cx - left)] |= TILE_FLAGS.get(block.name, SOLID)
+            cells.setdefault((cx - left, cy - top), []).append(block)
+
+        # Merge runs of cells with the same flags into one collider each
+        kinds = {(cx, cy): grid.flags[cy * grid.cols + cx] for cx, cy in cells}
+        for cx, cy, width, height in greedy_rectangles(kinds):
+            tiles = [tile for x in range(cx, cx + width) for y in range(cy, cy + height) for tile in cells[(x, y)]]
+            rect = ((cx + left) * cell_size + origin_x, (cy + top) * cell_size + origin_y,
+                    width * cell_size, height * cell_size)
+            collider = Collider(rect, tiles, tiles[0].name)
+            for x in range(cx, cx + width):
+                for y in range(cy, cy + height):
+                    grid.colliders[y * grid.cols + x] = collider
+        return grid, off_grid
+
+    # Get the range of cell indices a rect overlaps, clipped to the grid
+    def cell_range(self, rect):
+        size = self.cell_size
+        x0 = max((rect.left - self.origin_x) // size - self.left, 0)
+        x1 = min((rect.right - 1 - self.origin_x) // size - self.left, self.cols - 1)
+        y0 = max((rect.top - self.origin_y) // size - self.top, 0)
+        y1 = min((rect.bottom - 1 - self.origin_y) // size - self.top, self.rows - 1)
+        return x0, x1, y0, y1
+
+    # Get the colliders covering the cells a rect overlaps
+    def query(self, rect, margin=0):
+        if margin:
+            rect = rect.inflate(margin * 2, margin * 2)
+        x0, x1, y0, y1 = self.cell_range(rect)
+        found = []
+        for cy in range(y0, y1 + 1):
+            row = cy * self.cols
+            for cx in range(x0, x1 + 1):
+                if self.flags[row + cx]:
+                    collider = self.colliders[row + cx]
+                    if collider not in found:
+                        found.append(collider)
+        return found
+
+# Sweep a sprite's rect along one axis, stopping at the nearest object whose mask it would touch.
+# Static tiles come from tile_grid (if given), everything else from spatial_hash.
+# Returns the (object, normal) contacts that stopped it; normals point from the object to the sprite.
+def sweep_axis(sprite, spatial_hash, delta, horizontal, tile_grid=None):
+    rect = sprite.rect
+    start = rect.copy()
+    end = start.copy()  # Assign through topleft so fractional velocities round like rect.x += dx
+    end.topleft = (start.x + delta, start.y) if horizontal else (start.x, start.y + delta)
+    sign = 1 if delta > 0 else -1
+    distance = abs(delta)
+    size = start.width if horizontal else start.height
+
+    region = start.union(end)
+    candidates = spatial_hash.query(region)
+    if tile_grid is not None:
+        candidates += tile_grid.query(region)
+
+    hits = []
+    for obj in candidates:
+        if obj is sprite:
+            continue
+        other = obj.rect
+
+        # Gap between the sprite's leading edge and the object, along the sweep
+        if horizontal:
+            if other.top >= start.bottom or other.bottom <= start.top:
+                continue  # Not in the sprite's path
+            gap = other.left - start.right if sign > 0 else start.left - other.right
+            depth = other.width
+        else:
+            if other.left >= start.right or other.right <= start.left:
+                continue  # Not in the sprite's path
+            gap = other.top - start.bottom if sign > 0 else start.top - other.bottom
+            depth = other.height
+
+        if gap >= distance or gap + depth <= 0 or gap < -size // 2:
+            continue  # Out of reach, already passed, or a moving object embedded too deep (see push_out)
+
+        # The bounding boxes overlap along the sweep, so confirm with a pixel test
+        # at the deepest point the sprite reaches inside the object
+        reach = sign * min(distance, gap + depth - 1)
+        rect.topleft = (start.x + reach, start.y) if horizontal else (start.x, start.y + reach)
+        if pygame.sprite.collide_mask(sprite, obj):
+            hits.append((gap, obj))
+
+    if not hits:
+        rect.topleft = end.topleft
+        return []
+
+    nearest = min(gap for gap, _ in hits)
+    travel = sign * nearest  # Stop flush against the nearest object
+    if nearest < 0:
+        # The bounding boxes already overlap. Only back out when the masks do too (e.g. a platform
+        # rose into the sprite); a mask inset in its rect just stops where it is, or it would be
+        # pushed out and slide back in on alternate ticks
+        rect.topleft = start.topleft
+        if not any(gap < 0 and pygame.sprite.collide_mask(sprite, obj) for gap, obj in hits):
+            travel = 0
+    rect.topleft = (start.x + travel, start.y) if horizontal else (start.x, start.y + travel)
+    normal = (-sign, 0) if horizontal else (0, -sign)
+    return [(obj, normal) for gap, obj in hits if gap == nearest]
+
+# Push a sprite out of the static objects it overlaps, along the axis it is least deep inside them
+# (e.g. a player spawned partly inside a platform), before it is swept. Objects are tested with
+# their masks. Returns the (object, normal) contacts, like sweep_axis.
+def push_out(sprite, objects):
+    contacts = []
+    for obj in objects:
+        rect, other = sprite.rect, obj.rect
+        if obj is sprite or not rect.colliderect(other) or not pygame.sprite.collide_mask(sprite, obj):
+            continue
+        depth, dx, dy, normal = min(
+            (rect.bottom - other.top, 0, other.top - rect.bottom, (0, -1)),  # Up, onto the object
+            (other.bottom - rect.top, 0, other.bottom - rect.top, (0, 1)),  # Down, below it
+            (rect.right - other.left, other.left - rect.right, 0, (-1, 0)),  # Out to the left
+            (other.right - rect.left, other.right - rect.left, 0, (1, 0)),  # Out to the right
+            key=lambda option: option[0])
+        rect.move_ip(dx, dy)
+        contacts.append((obj, normal))
+    return contacts
+
+# Move a sprite by (dx, dy) in a single pass, sweeping along x and then y.
+# Returns every (object, normal) contact; (0, -1) is ground and (0, 1) is a ceiling.
+def sweep_move(sprite, spatial_hash, dx, dy, tile_grid=None):
+    contacts = []
+    if dx:
+        contacts += sweep_axis(sprite, spatial_hash, dx, True, tile_grid)
+    if dy:
+        contacts += sweep_axis(sprite, spatial_hash, dy, False, tile_grid)
+    return contacts
@@ -0,0 +1,541 @@
+import pygame
+from os.path import basename, join, splitext
+from sprites import load_image, load_sprite_sheets, load_sprite_masks, sprite_sheet_paths, SPRITE_CACHE, TERRAIN_ATLAS
+from sprites import WORLD_SCALE, image_size, set_native_resolution
+from render import Background, DirtyRects
+from hud import get_bitmap_font, render_text
+from loader import ASSET_LOADED, ASSET_LOADER
+from asset_cache import SPRITE_ARCHIVE
+from timestep import FixedTimestep, Interpolator
+from world import BASE_TICK_RATE, JUMP, read_keys
+from replay import InputRecording
+from profiler import PROFILER, ProfilerOverlay
+from levels import load_level
+pygame.init()
+
+# Set the caption of the window
+pygame.display.set_caption("Platformer")
+
+# Constants for window dimensions and frames per second
+WIDTH, HEIGHT = 1000, 800
+FPS = 60  # Simulation ticks per second; speeds and animation delays are per BASE_TICK_RATE tick and scaled to it
+RENDER_FPS = 60  # Render frame cap; 0 draws as often as the machine allows (keeps a CPU core busy)
+DIRTY_RECTS = False  # Repaint and present only the regions that changed (helps software-rendered displays)
+NATIVE_RESOLUTION = False  # Keep sprites at art size and draw on a half-size back buffer scaled up once (no DIRTY_RECTS)
+BACKGROUND_PARALLAX = 0  # Fraction of the camera scroll applied to the background (0 keeps it fixed)
+RECORD_INPUT = None  # Record each level's input for replay.py ("run.rec" saves run_level1.rec, ...); None disables it
+PROFILE = False  # Start with the frame profiler and its overlay on (F3 toggles them, F4 saves a trace)
+PROFILE_TRACE = "frame_trace.json"  # Chrome trace-event file written by F4
+LEVELS = [join("levels", f"level{n}.json") for n in (1, 2, 3)]  # Played in order; keys 1-9 jump to a level
+
+# Create a display window
+window = pygame.display.set_mode((WIDTH, HEIGHT))
+
+# Player class with attributes and behavior; the character and physics come from the level file
+class Player(pygame.sprite.Sprite):
+    COLOR = (255, 0, 0)  # Red color for player (for debugging or placeholder)
+    ANIMATION_DELAY = 3  # Delay between animation frames
+    SPRITE_SIZE = 32  # Frame size on the character sheets
+
+    def __init__(self, x, y, width, height, character="PinkMan", gravity=2, jump_strength=2, fall_threshold=4):
+        super().__init__()
+        size = self.SPRITE_SIZE
+        self.SPRITES = load_sprite_sheets("MainCharacters", character, size, size, True)  # Load player sprites
+        self.MASKS = load_sprite_masks("MainCharacters", character, size, size, True)  # Per-frame collision masks
+        self.GRAVITY = gravity  # Gravity constant
+        self.jump_strength = jump_strength  # Jump speed, in multiples of gravity
+        self.fall_threshold = fall_threshold  # Falling speed, in multiples of gravity, that shows the fall animation
+        self.rect = pygame.Rect(x, y, width, height)  # Player's rectangle for positioning
+        self.x_vel = 0  # Horizontal velocity
+        self.y_vel = 0  # Vertical velocity
+        self.mask = None  # Mask for collision detection
+        self.direction = "right"  # Default direction
+        self.animation_count = 0  # Animation frame counter
+        self.fall_count = 0  # Counter for falling
+        self.jump_count = 0  # Counter for jumps
+        self.hit = False  # Whether the player is hit
+        self.hit_count = 0  # Counter for hit duration
+        self.health = 1
+
+    def take_damage(self):
+        if self.hit_count == 0:  # Only decrease health once per hit
+            self.health -= 1
+            self.hit = True
+
+    # Function to handle jumping logic
+    def jump(self):
+        self.y_vel = -self.GRAVITY * self.jump_strength  # Set upward velocity for jump
+        self.animation_count = 0
+        self.jump_count += 1
+        if self.jump_count == 1:
+            self.fall_count = 0
+
+    # Move the player by a certain amount
+    def move(self, dx, dy):
+        self.rect.x += dx
+        self.rect.y += dy
+
+    # Set hit state to True
+    def make_hit(self):
+        self.hit = True
+
+    # Move player left
+    def move_left(self, vel):
+        self.x_vel = -vel
+        if self.direction != "left":
+            self.direction = "left"
+            self.animation_count = 0  # Reset animation if direction changes
+
+    # Move player right
+    def move_right(self, vel):
+        self.x_vel = vel
+        if self.direction != "right":
+            self.direction = "right"
+            self.animation_count = 0
+
+    # Game loop logic for the player
+    def loop(self, fps):
+        scale = BASE_TICK_RATE / fps  # Base-rate ticks this tick stands for
+
+        # Gravity effect
+        self.y_vel += min(1, (self.fall_count / fps) * self.GRAVITY) * scale  # Movement itself is applied by handle_move
+
+        # Handle hit logic
+        if self.hit:
+            self.hit_count += 1
+        if self.hit_count > fps * 2:  # Reset hit after a delay
+            self.hit = False
+            self.hit_count = 0
+
+        self.fall_count += 1
+        self.update_sprite(scale)
+
+    # Handle when the player lands on a surface
+    def landed(self):
+        self.fall_count = 0
+        self.y_vel = 0
+        self.jump_count = 0
+
+    # Handle head collision when hitting a ceiling
+    def hit_head(self):
+        self.count = 0
+        self.y_vel *= -1  # Invert the velocity when hitting a ceiling
+
+    # Update the current sprite based on the player's state
+    def update_sprite(self, scale=1):
+        sprite_sheet = "idle"  # Default state is idle
+        if self.hit:
+            sprite_sheet = "hit"
+        elif self.y_vel < 0:  # Jumping
+            if self.jump_count == 1:
+                sprite_sheet = "jump"
+            elif self.jump_count == 2:
+                sprite_sheet = "double_jump"
+        elif self.y_vel > self.GRAVITY * self.fall_threshold:  # Falling
+            sprite_sheet = "fall"
+        elif self.x_vel != 0:  # Running
+            sprite_sheet = "run"
+
+        sprite_sheet_name = sprite_sheet + "_" + self.direction  # Determine direction-specific sprite
+        sprites = self.SPRITES[sprite_sheet_name]
+        sprite_index = int(self.animation_count //
+                           self.ANIMATION_DELAY) % len(sprites)  # Cycle through animation frames
+        self.sprite = sprites[sprite_index]
+        self.sprite_mask = self.MASKS[sprite_sheet_name][sprite_index]  # Matching precomputed mask
+        self.animation_count += scale
+        self.update()
+
+    # Update player's rectangle and mask based on current sprite (the mask is world size even when the sprite is not)
+    def update(self):
+        self.rect = self.sprite_mask.get_rect(topleft=(self.rect.x, self.rect.y))
+        self.mask = self.sprite_mask
+
+    # Draw the player on the screen; scale is world pixels per screen pixel, offset_x is in screen pixels
+    def draw(self, win, offset_x, scale=1):
+        win.blit(self.sprite, (self.rect.x // scale - offset_x, self.rect.y // scale))
+
+# Base class for objects in the game world
+class Object(pygame.sprite.Sprite):
+    def __init__(self, x, y, width, height, name=None, image=None):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, width, height)
+        if image is None:
+            image = pygame.Surface(image_size(width, height), pygame.SRCALPHA)
+        self.image = image  # Objects may share an image (e.g. terrain tiles)
+        self.width = width
+        self.height = height
+        self.name = name  # Name for identifying object type
+
+    # Draw the object on the screen, like Player.draw
+    def draw(self, win, offset_x, scale=1):
+        win.blit(self.image, (self.rect.x // scale - offset_x, self.rect.y // scale))
+            
+
+# Block class for terrain objects
+# Block class for terrain objects
+class Block(Object):
+    def __init__(self, x, y, size, sprite_x=96, sprite_y=0):  # Add sprite_x and sprite_y parameters
+        image, mask = TERRAIN_ATLAS.get_tile(size, sprite_x, sprite_y)  # One image and mask per material
+        super().__init__(x, y, size, size, image=image)
+        self.mask = mask  # Shared mask for collision
+
+# Fire trap class
+class Fire(Object):
+    SHEET = ("Traps", "Fire")  # Sprite folder, also used to preload the trap's images
+    ANIMATION_DELAY = 3  # Delay between animation frames
+
+    def __init__(self, x, y, width, height):
+        super().__init__(x, y, width, height, "fire")  # Set fire name
+        self.fire = load_sprite_sheets(*self.SHEET, width, height)  # Load fire sprites
+        self.fire_masks = load_sprite_masks(*self.SHEET, width, height)  # Matching collision masks
+        self.image = self.fire["off"][0]  # Default to "off" state
+        self.mask = self.fire_masks["off"][0]
+        self.animation_count = 0
+        self.animation_name = "off"  # Default state is off
+
+    # Turn the fire trap on
+    def on(self):
+        self.animation_name = "on"
+
+    # Turn the fire trap off
+    def off(self):
+        self.animation_name = "off"
+
+    # Handle the fire trap animation loop
+    def loop(self, fps):
+        sprites = self.fire[self.animation_name]  # Get current animation based on state
+        sprite_index = int(self.animation_count //
+                           self.ANIMATION_DELAY) % len(sprites)
+        self.image = sprites[sprite_index]
+        self.animation_count += BASE_TICK_RATE / fps
+
+        self.mask = self.fire_masks[self.animation_name][sprite_index]
+        self.rect = self.mask.get_rect(topleft=(self.rect.x, self.rect.y))
+
+        if self.animation_count // self.ANIMATION_DELAY > len(sprites):
+            self.animation_count = 0  # Reset animation counter
+
+# Saw trap class
+class Saw(Object):
+    SHEET = ("Traps", "Saw")  # Sprite folder, also used to preload the trap's images
+    ANIMATION_DELAY = 3  # Delay between animation frames
+
+    def __init__(self, x, y, width, height):
+        super().__init__(x, y, width, height, "saw")  # Set saw name
+        self.saw = load_sprite_sheets(*self.SHEET, width, height)  # Load saw sprites
+        self.saw_masks = load_sprite_masks(*self.SHEET, width, height)  # Matching collision masks
+        self.image = self.saw["on"][0]  # Default to "off" state
+        self.mask = self.saw_masks["on"][0]
+        self.animation_count = 0
+        self.animation_name = "off"  # Default state is off
+
+    # Turn the saw trap on
+    def on(self):
+        self.animation_name = "on"
+
+    # Turn the saw trap off
+    def off(self):
+        self.animation_name = "off"
+
+    # Handle the saw trap animation loop
+    def loop(self, fps):
+        sprites = self.saw[self.animation_name]  # Get current animation based on state
+        sprite_index = int(self.animation_count //
+                           self.ANIMATION_DELAY) % len(sprites)
+        self.image = sprites[sprite_index]
+        self.animation_count += BASE_TICK_RATE / fps
+
+        self.mask = self.saw_masks[self.animation_name][sprite_index]
+        self.rect = self.mask.get_rect(topleft=(self.rect.x, self.rect.y))
+
+        if self.animation_count // self.ANIMATION_DELAY > len(sprites):
+            self.animation_count = 0  # Reset animation counter
+
+# SpikeHead trap class
+class SpikeHead(Object):
+    SHEET = ("Traps", "Spike Head")  # Sprite folder, also used to preload the trap's images
+    ANIMATION_DELAY = 12  # Delay between animation frames
+
+    def __init__(self, x, y, width, height, speed=3, min_y=100, max_y=800):
+        super().__init__(x, y, width, height, "spike_head")  # Set spikehead name
+        self.spike_head = load_sprite_sheets(*self.SHEET, width, height)  # Load SpikeHead sprites
+        self.spike_head_masks = load_sprite_masks(*self.SHEET, width, height)  # Matching collision masks
+        self.mask = pygame.mask.Mask((width, height))  # Empty until the first animation frame
+        self.animation_count = 0
+        self.animation_name = "Blink (54x52)"  # Default state is off
+        self.speed = speed  # Vertical movement speed
+        self.y = y  # Exact vertical position; rect.y is it rounded to whole pixels
+        self.direction = 1  # Direction of movement (1 for down, -1 for up)
+        self.min_y = min_y  # Minimum Y position (top limit)
+        self.max_y = max_y  # Maximum Y position (bottom limit)
+
+    # Turn the spikehead trap off
+    def Blink(self):
+        self.animation_name = "Blink (54x52)"
+
+        # Move the spike head up and down
+    def move(self, fps):
+        self.y += self.speed * self.direction * BASE_TICK_RATE / fps  # Move vertically
+        self.rect.y = round(self.y)
+
+        # Reverse direction if it hits the movement limits
+        if self.rect.y <= self.min_y:
+            self.direction = 1  # Start moving down
+        elif self.rect.y >= self.max_y:
+            self.direction = -1  # Start moving up
+
+    # Handle the spikehead trap animation loop and movement
+    def loop(self, fps):
+        self.move(fps)  # Move the spike head up and down
+
+        sprites = self.spike_head[self.animation_name]  # Get current animation based on state
+        sprite_index = int(self.animation_count // self.ANIMATION_DELAY) % len(sprites)
+        self.image = sprites[sprite_index]
+        self.animation_count += BASE_TICK_RATE / fps
+
+        # Reset animation counter if it exceeds the sprite list length
+        if self.animation_count // self.ANIMATION_DELAY > len(sprites):
+            self.animation_count = 0
+
+        # Update the rect and mask after movement
+        self.mask = self.spike_head_masks[self.animation_name][sprite_index]
+        self.rect = self.mask.get_rect(topleft=(self.rect.x, self.rect.y))
+
+class MovingPlatform(Object):
+    def __init__(self, x, y, width, height, speed, min_y, max_y):
+        super().__init__(x, y, width, height, "moving_platform")
+        self.image.fill((0, 0, 0))  # Make the platform black
+        self.speed = speed  # Speed of vertical movement
+        self.y = y  # Exact vertical position; rect.y is it rounded to whole pixels
+        self.direction = 1  # Direction of movement (1 for down, -1 for up)
+        self.min_y = min_y  # Minimum Y position (top)
+        self.max_y = max_y  # Maximum Y position (bottom)
+
+    def move(self, fps):
+        # Move the platform vertically
+        self.y += self.speed * self.direction * BASE_TICK_RATE / fps
+        self.rect.y = round(self.y)
+
+        # Reverse direction if it reaches the limits
+        if self.rect.y <= self.min_y:
+            self.direction = 1  # Start moving down
+        elif self.rect.y >= self.max_y:
+            self.direction = -1  # Start moving up
+
+    def loop(self, fps):
+        self.move(fps)  # Move the platform every tick
+
+# Classes the level file's objects are built from
+LEVEL_TYPES = {"player": Player, "block": Block, "platform": MovingPlatform, "fire": Fire, "saw": Saw,
+               "spike_head": SpikeHead}
+
+BACKGROUNDS = {}  # Background name -> composed Background, for the level being played
+
+# Function to get the file of a background image
+def background_path(name):
+    return join("assets", "Background", name)
+
+# Function to get the world pixels per screen pixel the levels are drawn at
+def render_scale():
+    return WORLD_SCALE if NATIVE_RESOLUTION else 1
+
+# Function to load a background image and compose it into one scroll-aware surface, the size of what is drawn
+def get_background(name):
+    background = BACKGROUNDS.get(name)
+    if background is None:
+        image = load_image(background_path(name), alpha=False)  # Load background image
+        scale = render_scale()
+        if scale > 1:  # Shrink the tile as well, so it is back at its own size once the scene is scaled up
+            image = pygame.transform.smoothscale(image, (image.get_width() // scale, image.get_height() // scale))
+        background = BACKGROUNDS[name] = Background(image, WIDTH // scale, HEIGHT // scale, BACKGROUND_PARALLAX)
+    return background
+
+# Function to list the sprite sheets (SpriteCache keys) and terrain tiles (TerrainAtlas keys) a level uses
+def level_sprite_keys(level):
+    data = load_level(LEVELS[level])
+    size = Player.SPRITE_SIZE
+    sheets = [("MainCharacters", data.player.get("character", "PinkMan"), size, size, True)]
+    for type_index, _, _, _, width, height, *_ in data.entities:
+        sheet = getattr(LEVEL_TYPES[data.types[type_index]], "SHEET", None)
+        if sheet is not None and (*sheet, width, height, False) not in sheets:
+            sheets.append((*sheet, width, height, False))
+    tiles = sorted({(data.block_size, sprite_x, sprite_y) for _, _, sprite_x, sprite_y, _ in data.blocks})
+    return sheets, tiles
+
+# Function to list the image files a level needs before its first frame can be drawn.
+# Sheets and tiles found in the prebuilt sprite archive need no PNG at all, except at native
+# resolution: the archive holds world-size frames.
+def level_assets(level):
+    sheets, tiles = level_sprite_keys(level)
+    paths = []
+    for key in sheets:
+        if NATIVE_RESOLUTION or not SPRITE_ARCHIVE.has_sheet(key):
+            paths += sprite_sheet_paths(*key[:2])
+    if NATIVE_RESOLUTION or not all(SPRITE_ARCHIVE.has_tile(key) for key in tiles):
+        paths.append(TERRAIN_ATLAS.path)
+    return paths + [background_path(load_level(LEVELS[level]).background)]
+
+# Show a progress bar until the given images are decoded; the window stays responsive meanwhile
+def loading_screen(window, paths):
+    clock = pygame.time.Clock()
+    font = get_bitmap_font("White", 3)  # The glyph sheet is tiny, so it is loaded up front
+    bar = pygame.Rect(WIDTH // 4, HEIGHT // 2, WIDTH // 2, 24)
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                ASSET_LOADER.shutdown()
+                pygame.quit()
+                quit()
+        ASSET_LOADER.poll()  # Convert whatever the workers finished, on this thread
+        done = ASSET_LOADER.progress(paths)
+        if done == len(paths):
+            return
+
+        window.fill((0, 0, 0))
+        text = f"LOADING {done}/{len(paths)}"
+        font.draw(window, text, (WIDTH // 2 - font.size(text)[0] // 2, bar.y - 60))
+        pygame.draw.rect(window, (255, 255, 255), bar, 2)
+        window.fill((255, 255, 255), (bar.x, bar.y, bar.width * done // len(paths), bar.height))
+        pygame.display.update()
+        clock.tick(60)
+
+# Main game loop
+def game_over(window, level=0):
+    game_over_text = render_text('comicsans', 60, "Game Over", (255, 0, 0))
+    restart_text = render_text('comicsans', 60, "Press R to Restart or Q to Quit", (255, 255, 255))
+
+    window.fill((0, 0, 0))  # Fill the screen with black
+    window.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 100))
+    window.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 50))
+    pygame.display.update()
+
+    # Wait for the player to press R or Q
+    run = True
+    while run:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+                pygame.quit()
+                quit()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r:  # Restart the level
+                    main(window, level)
+                if event.key == pygame.K_q:  # Quit the game
+                    run = False
+                    pygame.quit()
+                    quit()
+
+# Build a level from its level file, wrapped in a World that simulates it
+def build_world(level=0, render=True):
+    set_native_resolution(NATIVE_RESOLUTION)  # Sprites are loaded at the size they are drawn at
+    return load_level(LEVELS[level]).build(LEVEL_TYPES, FPS, (WIDTH, HEIGHT), render, render_scale())
+
+# Build a level and its background, keeping the assets it shares with the previous level resident
+# (terrain sheet, character and trap sheets, backgrounds) and freeing the ones it no longer uses
+def start_level(level):
+    SPRITE_CACHE.track_usage()
+    TERRAIN_ATLAS.track_usage()
+    world = build_world(level)
+    name = load_level(LEVELS[level]).background
+    background = get_background(name)
+    SPRITE_CACHE.release_unused()
+    TERRAIN_ATLAS.release_unused()
+    for unused in [key for key in BACKGROUNDS if key != name]:
+        del BACKGROUNDS[unused]
+    return world, background
+
+# Function to get the input recording file for a level, e.g. "run_level2.rec"
+def recording_path(level):
+    base, ext = splitext(RECORD_INPUT)
+    return f"{base}_{splitext(basename(LEVELS[level]))[0]}{ext}"
+
+def main(window, level=0):
+    clock = pygame.time.Clock()  # Create a clock object for managing time
+    dirty_rects = DirtyRects(window.get_rect()) if DIRTY_RECTS and not NATIVE_RESOLUTION else None
+    PROFILER.enabled = PROFILE
+    overlay = ProfilerOverlay(pos=(WIDTH - ProfilerOverlay.WIDTH - 10, 10))
+    next_level = level  # Level to switch to before the next frame, or None
+
+    # Decode this level's images on worker threads, then every other level's while the game runs
+    first_screen = level_assets(level)
+    ASSET_LOADER.request(first_screen)
+    for other in range(len(LEVELS)):
+        ASSET_LOADER.request(level_assets(other))
+    loading_screen(window, first_screen)  # Start as soon as the first level can be drawn
+
+    run = True
+    while run:
+        # Switch levels in-process: only assets the new level doesn't share with the old one are loaded
+        if next_level is not None:
+            level, next_level = next_level, None
+            world, background = start_level(level)
+            player = world.player
+            timestep = FixedTimestep(FPS)  # Simulate FPS ticks per second whatever the render rate
+            interpolator = Interpolator([player, *world.dynamic_objects])
+            previous_offset_x = world.offset_x
+            jump = 0  # Jump pressed since the last tick
+            recording = InputRecording(FPS) if RECORD_INPUT else None
+            if dirty_rects is not None:
+                dirty_rects.invalidate()
+
+        clock.tick(RENDER_FPS)  # Cap the render rate
+        PROFILER.begin_frame()
+
+        # Handle events like quitting and jumping
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+                break
+
+            if event.type == ASSET_LOADED:
+                ASSET_LOADER.finish(event.path)  # Convert a preloaded image on the main thread
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    jump = JUMP  # Jump on the next tick
+                elif event.key == pygame.K_F3:
+                    PROFILER.toggle()  # Show or hide the frame profiler
+                    if dirty_rects is not None:
+                        dirty_rects.invalidate()  # Repaint whatever the overlay covered
+                elif event.key == pygame.K_F4:
+                    PROFILER.export_trace(PROFILE_TRACE)  # Save the buffered frames for chrome://tracing
+                elif pygame.K_1 <= event.key <= pygame.K_9 and event.key - pygame.K_1 < len(LEVELS):
+                    next_level = event.key - pygame.K_1  # Jump straight to a level
+        PROFILER.mark("events")
+
+        # Run the simulation ticks that are due since the last frame
+        for _ in range(timestep.advance()):
+            interpolator.snapshot()
+            previous_offset_x = world.offset_x
+            buttons = read_keys() | jump
+            world.step(buttons)
+            jump = 0
+            if recording is not None:
+                recording.record(buttons, world)  # Keep the input and a checksum of the resulting state
+
+        # Draw everything between the last two ticks so motion stays smooth at any frame rate
+        interpolator.apply(timestep.alpha)
+        world.draw(window, background, round(timestep.lerp(previous_offset_x, world.offset_x)), dirty_rects,
+                   overlay)
+        interpolator.restore()
+        PROFILER.end_frame()
+
+        if world.completed and next_level is None:
+            next_level = (level + 1) % len(LEVELS)  # Reached the goal: on to the next level
+        if recording is not None and (next_level is not None or player.health <= 0):
+            recording.save(recording_path(level))  # Save before the game over screen, which may restart or quit
+            recording = None
+
+        if player.health <= 0:  # Check if player's health is 0
+            run = False  # End the game loop
+            game_over(window, level)  # Display the game over screen
+
+    if recording is not None:
+        recording.save(recording_path(level))
+    ASSET_LOADER.shutdown()
+    pygame.quit()  # Quit the game
+    quit()
+
+
+if __name__ == "__main__":
+    main(window)  # Run the game
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import json
+import argparse
+import importlib.util
+from itertools import cycle, islice
+from os.path import abspath, basename, dirname
+from world import LEFT, RIGHT, JUMP
+from replay import InputRecording
+
+# Function to import a game script (e.g. "Game_Jam_Fall24(2).py") with no real window or audio
+def load_game(path):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"  # Must be set before the script opens its window
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    path = abspath(path)
+    os.chdir(dirname(path))  # Asset paths are relative to the game folder
+    name = "".join(c if c.isalnum() else "_" for c in basename(path)[:-3]).lower()
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    game = importlib.util.module_from_spec(spec)
+    sys.modules[name] = game
+    spec.loader.exec_module(game)
+    return game
+
+# Function to parse an input script such as "R:120 RJ:1 R:30 L:90 :30" into per-tick input bits.
+# Each step is the buttons held (L, R, J) and how many ticks to hold them for.
+def parse_input(script):
+    bits = {"L": LEFT, "R": RIGHT, "J": JUMP}
+    steps = []
+    for step in script.split():
+        buttons, _, count = step.partition(":")
+        value = 0
+        for char in buttons.upper():
+            value |= bits[char]
+        steps.extend([value] * int(count or 1))
+    return steps or [0]
+
+# Run a level with no rendering and no frame cap, as fast as the machine allows
+# Pass an InputRecording as recording to capture the run for replay.py.
+def run_headless(game, ticks, inputs, stop_on_death=False, recording=None):
+    world = game.build_world(render=False)
+    died_at = None
+
+    start = time.perf_counter()
+    for buttons in islice(cycle(inputs), ticks):
+        world.step(buttons)
+        if recording is not None:
+            recording.record(buttons, world)
+        if died_at is None and world.player.health <= 0:
+            died_at = world.ticks
+            if stop_on_death:
+                break
+    elapsed = time.perf_counter() - start
+
+    simulated = world.ticks / game.FPS
+    return {
+        "ticks": world.ticks,
+        "wall_seconds": elapsed,
+        "ticks_per_second": world.ticks / elapsed if elapsed else float("inf"),
+        "simulated_seconds": simulated,
+        "speedup": simulated / elapsed if elapsed else float("inf"),  # Simulated seconds per wall-clock second
+        "player": list(world.player.rect.topleft),
+        "health": world.player.health,
+        "died_at_tick": died_at,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a level headless and faster than real time")
+    parser.add_argument("game", help='game script, e.g. "Game_Jam_Fall24(2).py"')
+    parser.add_argument("--seconds", type=float, default=60, help="simulated seconds to run")
+    parser.add_argument("--input", default="R:120 RJ:1 R:60 L:90 LJ:1 L:30 :60",
+                        help="input script, repeated until the run ends")
+    parser.add_argument("--stop-on-death", action="store_true", help="stop when the player's health reaches 0")
+    parser.add_argument("--record", help="write the run's input to this file for replay.py")
+    args = parser.parse_args()
+
+    record_path = abspath(args.record) if args.record else None  # Resolve before load_game changes directory
+    game = load_game(args.game)
+    recording = InputRecording(game.FPS) if record_path else None
+    result = run_headless(game, int(args.seconds * game.FPS), parse_input(args.input), args.stop_on_death, recording)
+    if recording is not None:
+        recording.save(record_path)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,109 @@
+import pygame
+from collections import OrderedDict
+from os.path import join
+from sprites import load_image
+
+# Fonts built once per (name, size) instead of on every frame
+FONTS = {}
+
+# Function to get a system font, constructing it only the first time
+def get_font(name, size):
+    font = FONTS.get((name, size))
+    if font is None:
+        font = FONTS[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+# LRU cache of rendered text surfaces keyed by (font, string, colour)
+class TextCache:
+    def __init__(self, capacity=64):
+        self.capacity = capacity  # Most surfaces kept before the least recently used is dropped
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # Get the surface for a string, rendering it only if it is not cached
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)  # Evict the least recently used surface
+        return surface
+
+    # Drop every cached surface
+    def clear(self):
+        self.surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+# Function to render HUD text through the shared font and text caches
+def render_text(font_name, size, text, color):
+    return TEXT_CACHE.render(get_font(font_name, size), text, color)
+
+# Characters on the assets/Menu/Text glyph sheets, row by row
+GLYPH_ROWS = ["ABCDEFGHIJ", "KLMNOPQRST", "UVWXYZ", "0123456789", ".,:?!()+-"]
+
+# Function to get the glyph sheet of a text colour ("White" or "Black")
+def glyph_sheet_path(sheet_name):
+    return join("assets", "Menu", "Text", f"Text ({sheet_name}) (8x10).png")
+
+# Bitmap font sliced once from a glyph sheet; strings are drawn with one batched blits() call
+class BitmapFont:
+    GLYPH_WIDTH, GLYPH_HEIGHT = 8, 10
+
+    # color is a sheet name ("White" or "Black") or an RGB tuple used to tint the white sheet
+    def __init__(self, color="White", scale=1):
+        sheet_name = color if isinstance(color, str) else "White"
+        sheet = load_image(glyph_sheet_path(sheet_name))
+        if not isinstance(color, str):
+            sheet.fill((*color, 255), special_flags=pygame.BLEND_RGBA_MULT)  # Tint the white glyphs
+        if scale != 1:
+            sheet = pygame.transform.scale(sheet, (sheet.get_width() * scale, sheet.get_height() * scale))
+
+        self.atlas = sheet  # Every glyph lives in this one surface
+        self.glyph_width = self.GLYPH_WIDTH * scale
+        self.glyph_height = self.GLYPH_HEIGHT * scale
+        self.glyphs = {}  # Character -> area of the atlas
+        for row, chars in enumerate(GLYPH_ROWS):
+            for col, char in enumerate(chars):
+                self.glyphs[char] = pygame.Rect(col * self.glyph_width, row * self.glyph_height,
+                                                self.glyph_width, self.glyph_height)
+
+    # Get the pixel size of a string
+    def size(self, text):
+        return len(text) * self.glyph_width, self.glyph_height
+
+    # Get the screen rect a string covers when drawn at pos
+    def get_rect(self, text, pos):
+        return pygame.Rect(pos, self.size(text))
+
+    # Draw a string at pos; unknown characters (e.g. spaces) just advance the cursor
+    def draw(self, win, text, pos):
+        x, y = pos
+        glyphs = self.glyphs
+        batch = []
+        for char in text.upper():
+            area = glyphs.get(char)
+            if area is not None:
+                batch.append((self.atlas, (x, y), area))
+            x += self.glyph_width
+        win.blits(batch, doreturn=False)
+
+
+# Bitmap fonts built once per (colour, scale)
+BITMAP_FONTS = {}
+
+# Function to get a bitmap font, slicing its glyph sheet only the first time
+def get_bitmap_font(color="White", scale=1):
+    key = (color if isinstance(color, str) else tuple(color), scale)
+    font = BITMAP_FONTS.get(key)
+    if font is None:
+        font = BITMAP_FONTS[key] = BitmapFont(color, scale)
+    return font
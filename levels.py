@@ -0,0 +1,171 @@
+import os
+import json
+import struct
+from os.path import basename, dirname, join, splitext
+from world import World
+
+# Terrain materials by name: top-left corner of the block in Terrain.png
+MATERIALS = {
+    "stone": (0, 0),
+    "grass": (96, 0),
+    "copper": (192, 0),
+    "wood": (0, 64),
+    "brown_grass": (96, 64),
+    "steel": (192, 64),
+    "emerald": (0, 128),
+    "purple_grass": (96, 128),
+    "bronze": (192, 128),
+    "goal": (272, 128),
+}
+
+# Method that switches each kind of trap on when the level starts
+TRAP_STARTS = {"fire": "on", "saw": "on", "spike_head": "Blink"}
+
+# Compiled cache file layout (little-endian):
+#   header:   magic, version, source mtime (ns), source size, meta length, block count, entity count
+#   meta:     JSON with the level's scalar settings
+#   blocks:   x, y, sprite x, sprite y, goal flag
+#   entities: type index, moves flag, x, y, width, height, speed, min y, max y
+CACHE_MAGIC = b"GJLV"
+CACHE_VERSION = 2
+CACHE_HEADER = struct.Struct("<4sHqqIII")
+BLOCK = struct.Struct("<iiHHB")
+ENTITY = struct.Struct("<BBiiiiddd")
+
+# A level ready to be built: scalar settings, terrain blocks and entities (platforms, then traps)
+class Level:
+    def __init__(self, meta, blocks, entities):
+        self.name = meta["name"]
+        self.block_size = meta["block_size"]
+        self.background = meta["background"]
+        self.hazards = set(meta["hazards"])  # Object names that hurt the player
+        self.spawn = meta["spawn"]  # Player rect: x, y, width, height
+        self.player = meta["player"]  # Player settings: speed, then keyword arguments for the player class
+        self.offset_x = meta["offset_x"]  # Initial camera offset
+        self.scroll_area_width = meta["scroll_area_width"]
+        self.types = meta["types"]  # Entity type names, indexed by the entity records
+        self.blocks = blocks  # (x, y, sprite_x, sprite_y, is_goal)
+        self.entities = entities  # (type index, moves, x, y, width, height, speed, min_y, max_y)
+
+    # Create the level's objects from a game's classes and wrap them in a World.
+    # classes maps "player", "block" and every entity type used by the level to a class.
+    # render_scale is the world pixels per screen pixel the World draws at (see World).
+    def build(self, classes, fps, view_size, render=True, render_scale=1):
+        size = self.block_size
+        settings = dict(self.player)
+        player_vel = settings.pop("speed")
+        player = classes["player"](*self.spawn, **settings)
+
+        blocks = []
+        for x, y, sprite_x, sprite_y, goal in self.blocks:
+            block = classes["block"](x, y, size, sprite_x, sprite_y)
+            if goal:
+                block.name = "level_end"  # Reaching it completes the level
+            blocks.append(block)
+
+        entities = []
+        for type_index, moves, x, y, width, height, speed, min_y, max_y in self.entities:
+            kind = self.types[type_index]
+            cls = classes[kind]
+            entity = cls(x, y, width, height, speed, min_y, max_y) if moves else cls(x, y, width, height)
+            start = TRAP_STARTS.get(kind)
+            if start is not None:
+                getattr(entity, start)()  # Turn the trap on
+            entities.append(entity)
+
+        return World(player, entities + blocks, blocks, size, fps, player_vel, self.hazards, view_size,
+                     self.offset_x, self.scroll_area_width, render, render_scale)
+
+# Function to turn a material name (or an explicit [sprite_x, sprite_y]) into sprite coordinates
+def material_coords(material):
+    if isinstance(material, str):
+        return MATERIALS[material]
+    return tuple(material)
+
+# Function to compile a level description (parsed JSON) into cache sections
+def compile_level(data):
+    blocks = []
+    for tile in data["tiles"]:
+        sprite_x, sprite_y = material_coords(tile.get("material", "grass"))
+        step_x, step_y = tile.get("step", (data["block_size"], 0))
+        for i in range(tile.get("count", 1)):
+            blocks.append((tile["x"] + i * step_x, tile["y"] + i * step_y, sprite_x, sprite_y, 0))
+    goal = data["goal"]
+    blocks.append((goal["x"], goal["y"], *material_coords(goal.get("material", "goal")), 1))
+
+    types = []
+    entities = []
+    for kind, entity in [("platform", platform) for platform in data.get("platforms", [])] + \
+                        [(trap["type"], trap) for trap in data.get("traps", [])]:
+        if kind not in types:
+            types.append(kind)
+        moves = "speed" in entity
+        entities.append((types.index(kind), moves, entity["x"], entity["y"], entity["width"], entity["height"],
+                         float(entity.get("speed", 0)), float(entity.get("min_y", 0)), float(entity.get("max_y", 0))))
+
+    spawn = data["spawn"]
+    camera = data.get("camera", {})
+    meta = {
+        "name": data.get("name", ""),
+        "block_size": data["block_size"],
+        "background": data.get("background", "Blue.png"),
+        "hazards": data.get("hazards", []),
+        "spawn": [spawn["x"], spawn["y"], spawn.get("width", 50), spawn.get("height", 50)],
+        "player": {"speed": 5, **data.get("player", {})},
+        "offset_x": camera.get("offset_x", spawn["x"] - 100),
+        "scroll_area_width": camera.get("scroll_area_width", 200),
+        "types": types,
+    }
+    return meta, blocks, entities
+
+# Function to get the cache file for a level file (kept in a __pycache__ folder next to it)
+def cache_path(path):
+    return join(dirname(path), "__pycache__", splitext(basename(path))[0] + ".lvl")
+
+# Function to write a compiled level to the cache, stamped with the source file's mtime and size
+def write_cache(path, stat, meta, blocks, entities):
+    meta_bytes = json.dumps(meta).encode()
+    os.makedirs(dirname(path), exist_ok=True)
+    temp = path + ".tmp"
+    with open(temp, "wb") as file:
+        file.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, stat.st_mtime_ns, stat.st_size,
+                                     len(meta_bytes), len(blocks), len(entities)))
+        file.write(meta_bytes)
+        file.write(b"".join(BLOCK.pack(*block) for block in blocks))
+        file.write(b"".join(ENTITY.pack(*entity) for entity in entities))
+    os.replace(temp, path)  # Readers never see a half-written cache
+
+# Function to read a compiled level from the cache, or None if it is missing or out of date
+def read_cache(path, stat):
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, version, mtime, size, meta_length, block_count, entity_count = CACHE_HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or mtime != stat.st_mtime_ns or size != stat.st_size:
+        return None
+
+    offset = CACHE_HEADER.size
+    meta = json.loads(data[offset:offset + meta_length])
+    offset += meta_length
+    blocks = list(BLOCK.iter_unpack(data[offset:offset + block_count * BLOCK.size]))
+    offset += block_count * BLOCK.size
+    entities = list(ENTITY.iter_unpack(data[offset:offset + entity_count * ENTITY.size]))
+    return meta, blocks, entities
+
+# Function to load a level file, from its compiled cache when the file has not changed since
+def load_level(path):
+    stat = os.stat(path)
+    cache = cache_path(path)
+    compiled = read_cache(cache, stat)
+    if compiled is None:
+        with open(path) as file:
+            compiled = compile_level(json.load(file))
+        try:
+            write_cache(cache, stat, *compiled)
+        except OSError:
+            pass  # A read-only install still loads, just without the cache
+    return Level(*compiled)
@@ -0,0 +1,66 @@
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+
+ASSET_LOADED = pygame.event.custom_type()  # Posted by a worker once an image is decoded; event.path says which
+
+# Decodes PNGs on a thread pool while the game keeps running. pygame.image.load releases the GIL
+# while it decodes, so workers overlap with the main thread. Converting to the display format
+# must happen on the main thread, in finish(), when the ASSET_LOADED event arrives.
+class AssetLoader:
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.executor = None  # Started on the first request, so runs that never preload spawn no threads
+        self.pending = {}  # path -> future of the decoded (unconverted) surface
+        self.images = {}  # path -> converted surface, until load_image() takes it
+        self.done = set()  # Paths decoded and converted
+
+    # Queue images for decoding, in order; paths already queued or loaded are skipped
+    def request(self, paths):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        for path in paths:
+            if path not in self.pending and path not in self.done:
+                self.pending[path] = self.executor.submit(self.decode, path)
+
+    # Runs on a worker thread
+    def decode(self, path):
+        try:
+            return pygame.image.load(path)
+        finally:
+            pygame.event.post(pygame.event.Event(ASSET_LOADED, path=path))  # Wake the main thread either way
+
+    # Convert a decoded image on the main thread (call on ASSET_LOADED; blocks if it is still decoding)
+    def finish(self, path):
+        future = self.pending.pop(path, None)
+        if future is None:
+            return  # Already finished, e.g. taken early by load_image()
+        self.images[path] = future.result().convert_alpha()  # Re-raises any decoding error here
+        self.done.add(path)
+
+    # Finish every image that has been decoded, in case an ASSET_LOADED event was missed
+    def poll(self):
+        for path in [path for path, future in self.pending.items() if future.done()]:
+            self.finish(path)
+
+    # Get a preloaded image, finishing it first if needed; None if it was never requested
+    def take(self, path):
+        if path in self.pending:
+            self.finish(path)
+        return self.images.pop(path, None)
+
+    # Count how many of the given paths are ready
+    def progress(self, paths):
+        return sum(path in self.done for path in paths)
+
+    def is_ready(self, paths):
+        return all(path in self.done for path in paths)
+
+    # Stop the workers, dropping anything not started yet
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
+
+
+ASSET_LOADER = AssetLoader()
@@ -0,0 +1,126 @@
+import json
+import time
+import pygame
+from collections import deque
+from hud import get_bitmap_font
+
+FRAME_BUDGET_MS = 1000 / 60  # One frame at 60 FPS
+PHASES = ["events", "player", "traps", "collision", "draw", "display"]  # main() loop phases, in order
+
+# Per-phase frame timings kept in a ring buffer. Code marks the end of each phase with mark(name);
+# the time since the previous mark is charged to that phase. Every call returns at once while disabled.
+class FrameProfiler:
+    def __init__(self, capacity=600, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.frames = deque(maxlen=capacity)  # (frame start, frame end, [(phase, start, end), ...])
+        self.events = []  # Phases of the frame in progress
+        self.frame_start = None
+        self.last = None  # When the previous phase ended
+
+    # Start timing a frame
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last = self.clock()
+        self.events = []
+
+    # Charge the time since the previous mark to a phase
+    def mark(self, name):
+        if not self.enabled or self.last is None:
+            return
+        now = self.clock()
+        self.events.append((name, self.last, now))
+        self.last = now
+
+    # Finish the frame and store it in the ring buffer
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.frames.append((self.frame_start, self.clock(), self.events))
+        self.frame_start = self.last = None
+
+    # Turn profiling on or off; frames already collected are kept
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_start = self.last = None
+
+    # Get the recorded frame times in milliseconds, oldest first
+    def frame_times(self):
+        return [(end - start) * 1000 for start, end, _ in self.frames]
+
+    # Get a percentile (0-100) of the recorded frame times in milliseconds
+    def percentile(self, percent):
+        times = sorted(self.frame_times())
+        if not times:
+            return 0.0
+        return times[min(len(times) - 1, len(times) * percent // 100)]
+
+    # Get each phase's mean time per frame in milliseconds over the last `last` frames (or all of them).
+    # Phases that run once per tick are summed per frame.
+    def phase_means(self, last=None):
+        frames = list(self.frames)[-last:] if last else self.frames
+        totals = dict.fromkeys(PHASES, 0.0)
+        for _, _, events in frames:
+            for name, start, end in events:
+                totals[name] = totals.get(name, 0.0) + (end - start) * 1000
+        count = len(frames) or 1
+        return {name: total / count for name, total in totals.items()}
+
+    # Write the buffered frames as Chrome trace events (open in chrome://tracing or Perfetto)
+    def export_trace(self, path):
+        events = []
+        for start, end, phases in self.frames:
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": start * 1e6, "dur": (end - start) * 1e6})
+            for name, phase_start, phase_end in phases:
+                events.append({"name": name, "ph": "X", "pid": 0, "tid": 0,
+                               "ts": phase_start * 1e6, "dur": (phase_end - phase_start) * 1e6})
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(self.frames)
+
+
+PROFILER = FrameProfiler()
+
+# On-screen frame time graph with p50/p99 and per-phase means
+class ProfilerOverlay:
+    WIDTH, HEIGHT = 260, 240
+    GRAPH_HEIGHT = 80
+    BAR_WIDTH = 2  # Pixels per frame in the graph
+
+    def __init__(self, profiler=PROFILER, pos=(730, 10)):
+        self.profiler = profiler
+        self.rect = pygame.Rect(pos, (self.WIDTH, self.HEIGHT))
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.font = get_bitmap_font("White", 2)
+
+    # Draw the overlay; does nothing while the profiler is disabled
+    def draw(self, win):
+        profiler = self.profiler
+        if not profiler.enabled:
+            return
+        panel = self.panel
+        panel.fill((0, 0, 0, 170))
+
+        # Frame time graph, newest frame on the right, scaled so the budget line sits at half height
+        scale = self.GRAPH_HEIGHT / (FRAME_BUDGET_MS * 2)
+        times = profiler.frame_times()[-(self.WIDTH // self.BAR_WIDTH):]
+        x = self.WIDTH - len(times) * self.BAR_WIDTH
+        for frame_ms in times:
+            height = min(self.GRAPH_HEIGHT, max(1, round(frame_ms * scale)))
+            color = (80, 220, 80) if frame_ms <= FRAME_BUDGET_MS else (230, 70, 60)
+            panel.fill(color, (x, self.GRAPH_HEIGHT - height, self.BAR_WIDTH, height))
+            x += self.BAR_WIDTH
+        budget_y = self.GRAPH_HEIGHT - round(FRAME_BUDGET_MS * scale)
+        panel.fill((255, 255, 255, 200), (0, budget_y, self.WIDTH, 1))
+
+        # Percentiles and where the time goes
+        font = self.font
+        y = self.GRAPH_HEIGHT + 4
+        font.draw(panel, f"P50 {profiler.percentile(50):.1f} P99 {profiler.percentile(99):.1f}", (4, y))
+        for name, mean in profiler.phase_means(len(times)).items():
+            y += font.glyph_height + 1
+            font.draw(panel, f"{name} {mean:.2f}", (4, y))
+
+        win.blit(panel, self.rect)
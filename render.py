@@ -0,0 +1,106 @@
+import pygame
+
+# Objects drawn vs. objects in the level on the last frame, to check draw cost follows screen content
+RENDER_STATS = {"drawn": 0, "total": 0, "chunks": 0}
+
+# Get the objects that intersect the camera rect, using a spatial index instead of scanning every object
+def visible_objects(index, offset_x, width, height, offset_y=0):
+    camera = pygame.Rect(offset_x, offset_y, width, height)
+    visible = [obj for obj in index.query(camera) if obj.rect.colliderect(camera)]
+    RENDER_STATS["drawn"] = len(visible)
+    RENDER_STATS["total"] = len(index)
+    return visible
+
+# Static terrain pre-composited into fixed-size chunk surfaces at level load.
+# With a scale above 1, object positions are divided by it (for images drawn at 1/scale of their world size).
+class StaticLayer:
+    def __init__(self, objects, chunk_size=1024, scale=1):
+        self.chunk_size = chunk_size
+        self.scale = scale
+        self.chunks = {}  # (chunk_x, chunk_y) -> surface holding every static object in that area
+        for obj in objects:
+            self.bake(obj)
+
+    # Draw an object into every chunk its image overlaps
+    def bake(self, obj):
+        size = self.chunk_size
+        rect = obj.image.get_rect(topleft=(obj.rect.x // self.scale, obj.rect.y // self.scale))
+        for chunk_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for chunk_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    chunk = pygame.Surface((size, size), pygame.SRCALPHA)
+                    self.chunks[(chunk_x, chunk_y)] = chunk
+                chunk.blit(obj.image, (rect.x - chunk_x * size, rect.y - chunk_y * size))
+
+    # Blit the chunks under the camera (at most four when the view is smaller than a chunk)
+    def draw(self, win, offset_x, offset_y=0):
+        size = self.chunk_size
+        width, height = win.get_size()
+        drawn = 0
+        for chunk_x in range(offset_x // size, (offset_x + width - 1) // size + 1):
+            for chunk_y in range(offset_y // size, (offset_y + height - 1) // size + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    win.blit(chunk, (chunk_x * size - offset_x, chunk_y * size - offset_y))
+                    drawn += 1
+        RENDER_STATS["chunks"] = drawn
+
+# Merge overlapping rects so no screen area is repainted or presented twice
+def merge_rects(rects):
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0  # The grown rect may now touch rects already checked
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+# Tracks the screen regions that changed between frames, for pygame.display.update(rects)
+class DirtyRects:
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.offset = None  # Camera offset of the last frame; None forces a full repaint
+        self.previous = []  # Regions drawn last frame, which must be cleared this frame
+        self.current = []  # Regions drawn this frame
+
+    # Mark a screen-space rect as changed this frame
+    def mark(self, rect):
+        rect = rect.clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current.append(rect)
+
+    # Finish the frame: the regions to repaint and present, or the whole screen if the camera scrolled
+    def regions(self, offset):
+        changed = self.previous + self.current
+        self.previous, self.current = self.current, []
+        if offset != self.offset:
+            self.offset = offset
+            return [self.screen_rect.copy()]
+        return merge_rects(changed)
+
+    # Force the next frame to repaint everything (e.g. after another screen was shown)
+    def invalidate(self):
+        self.offset = None
+
+# Tiled background composed once into a surface one tile larger than the screen,
+# so a single blit covers the view at any scroll position
+class Background:
+    def __init__(self, image, width, height, parallax=0):
+        self.tile_width, self.tile_height = image.get_size()
+        self.parallax = parallax  # Fraction of the camera scroll applied to the background (0 keeps it fixed)
+        self.surface = pygame.Surface((width + self.tile_width, height + self.tile_height)).convert()
+        for x in range(0, self.surface.get_width(), self.tile_width):
+            for y in range(0, self.surface.get_height(), self.tile_height):
+                self.surface.blit(image, (x, y))
+
+    # Draw the background shifted by the camera offset, wrapped to one tile
+    def draw(self, win, offset_x, offset_y=0):
+        shift_x = int(offset_x * self.parallax) % self.tile_width
+        shift_y = int(offset_y * self.parallax) % self.tile_height
+        win.blit(self.surface, (-shift_x, -shift_y))
@@ -0,0 +1,122 @@
+import zlib
+import json
+import struct
+import argparse
+
+# Recording file layout (little-endian):
+#   header:      magic, version, simulation fps, checkpoint interval, run count, checkpoint count
+#   runs:        (input bits, ticks held) pairs, one per change of input
+#   checkpoints: running CRC-32 of the world state, one every `interval` ticks plus one at the end
+MAGIC = b"GJIR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHII")
+RUN = struct.Struct("<BH")
+CHECKPOINT = struct.Struct("<II")  # Tick, CRC-32
+MAX_RUN = 0xFFFF  # Longer runs are split in two
+CHECKPOINT_INTERVAL = 60  # Ticks between stored checksums (one second at 60 ticks per second)
+
+# Function to get a running checksum of everything a tick can change
+def world_checksum(world, crc=0):
+    player = world.player
+    crc = zlib.crc32(struct.pack("<iiddiiid", player.rect.x, player.rect.y, player.x_vel, player.y_vel,
+                                 player.fall_count, player.jump_count, player.health, world.offset_x), crc)
+    for obj in world.dynamic_objects:
+        crc = zlib.crc32(struct.pack("<ii", obj.rect.x, obj.rect.y), crc)
+    return crc
+
+# A run's per-tick input bits, run-length encoded, plus checksums of the trajectory they produced
+class InputRecording:
+    def __init__(self, fps, interval=CHECKPOINT_INTERVAL):
+        self.fps = fps
+        self.interval = interval
+        self.runs = []  # [input bits, ticks held]
+        self.checkpoints = []  # (tick, checksum)
+        self.ticks = 0
+        self.crc = 0
+
+    # Record the input of one tick, and the world it produced
+    def record(self, buttons, world=None):
+        if self.runs and self.runs[-1][0] == buttons and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([buttons, 1])
+        self.ticks += 1
+
+        if world is not None:
+            self.crc = world_checksum(world, self.crc)
+            if self.ticks % self.interval == 0:
+                self.checkpoints.append((self.ticks, self.crc))
+
+    # Close the recording with a checksum of the final tick
+    def finish(self):
+        if self.ticks and (not self.checkpoints or self.checkpoints[-1][0] != self.ticks):
+            self.checkpoints.append((self.ticks, self.crc))
+
+    # Iterate over the input bits tick by tick
+    def __iter__(self):
+        for buttons, count in self.runs:
+            for _ in range(count):
+                yield buttons
+
+    def __len__(self):
+        return self.ticks
+
+    def save(self, path):
+        self.finish()
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.fps, self.interval, len(self.runs), len(self.checkpoints)))
+            file.write(b"".join(RUN.pack(buttons, count) for buttons, count in self.runs))
+            file.write(b"".join(CHECKPOINT.pack(tick, crc) for tick, crc in self.checkpoints))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, fps, interval, run_count, checkpoint_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+
+        recording = cls(fps, interval)
+        offset = HEADER.size
+        recording.runs = [list(run) for run in RUN.iter_unpack(data[offset:offset + run_count * RUN.size])]
+        offset += run_count * RUN.size
+        recording.checkpoints = list(CHECKPOINT.iter_unpack(data[offset:offset + checkpoint_count * CHECKPOINT.size]))
+        recording.ticks = sum(count for _, count in recording.runs)
+        return recording
+
+# Feed a recording back into a freshly built world and check it follows the recorded trajectory.
+# Returns the first tick whose checksum differs, or None if the replay matched throughout.
+def replay(recording, world):
+    checkpoints = dict(recording.checkpoints)
+    crc = 0
+    for buttons in recording:
+        world.step(buttons)
+        crc = world_checksum(world, crc)
+        expected = checkpoints.get(world.ticks)
+        if expected is not None and expected != crc:
+            return world.ticks
+    return None
+
+
+if __name__ == "__main__":
+    from headless import load_game
+
+    parser = argparse.ArgumentParser(description="Replay a recorded run headless and verify its trajectory")
+    parser.add_argument("game", help='game script the run was recorded with, e.g. "Game_Jam_Fall24(2).py"')
+    parser.add_argument("recording", help="input recording written by the game or headless.py --record")
+    args = parser.parse_args()
+
+    recording = InputRecording.load(args.recording)
+    game = load_game(args.game)
+    if recording.fps != game.FPS:
+        parser.error(f"recorded at {recording.fps} ticks per second, the game runs at {game.FPS}")
+    world = game.build_world(render=False)
+    diverged = replay(recording, world)
+    print(json.dumps({
+        "ticks": world.ticks,
+        "runs": len(recording.runs),
+        "checkpoints": len(recording.checkpoints),
+        "player": list(world.player.rect.topleft),
+        "diverged_at_tick": diverged,
+    }, indent=2))
+    raise SystemExit(diverged is not None)
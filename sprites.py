@@ -0,0 +1,286 @@
+import pygame
+from os import listdir
+from os.path import isfile, join
+from loader import ASSET_LOADER
+from asset_cache import SPRITE_ARCHIVE
+from atlas import TEXTURE_ATLAS
+
+WORLD_SCALE = 2  # The art is drawn at twice its size in the world (scale2x); collision masks are always world size
+
+# Function to load an image, using the background loader's copy when it was preloaded
+def load_image(path, alpha=True):
+    image = ASSET_LOADER.take(path)
+    if image is None:
+        image = pygame.image.load(path)
+        return image.convert_alpha() if alpha else image.convert()
+    return image if alpha else image.convert()
+
+# Function to list the image files of a sprite folder, as slice_sprite_sheets() reads them
+def sprite_sheet_paths(dir1, dir2):
+    path = join("assets", dir1, dir2)
+    return [join(path, f) for f in listdir(path) if isfile(join(path, f))]
+
+# Function to flip sprites horizontally
+def flip(sprites):
+    return [pygame.transform.flip(sprite, True, False) for sprite in sprites]
+
+# Function to slice every sprite sheet in an assets folder into scaled frames (or native-size ones)
+def slice_sprite_sheets(dir1, dir2, width, height, direction=False, native=False):
+    path = join("assets", dir1, dir2)  # Create the path to the folder
+    images = [f for f in listdir(path) if isfile(join(path, f))]  # List all images in the folder
+
+    all_sprites = {}
+
+    # Iterate through each image in the sprite sheet
+    for image in images:
+        sprite_sheet = load_image(join(path, image))  # Load the sprite sheet
+
+        sprites = []
+        # Extract individual sprites from the sprite sheet
+        for i in range(sprite_sheet.get_width() // width):
+            surface = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+            rect = pygame.Rect(i * width, 0, width, height)
+            surface.blit(sprite_sheet, (0, 0), rect)  # Copy each sprite into the surface
+            sprites.append(surface if native else pygame.transform.scale2x(surface))  # Scale up the sprite
+
+        # Directional sheets face right; the flipped versions are made when first looked up
+        if direction:
+            all_sprites[image.replace(".png", "") + "_right"] = sprites
+        else:
+            all_sprites[image.replace(".png", "")] = sprites
+
+    return MirroredSheet(all_sprites, flip) if direction else all_sprites
+
+# Frames by animation name for a directional sheet. Only the "_right" frames are stored up front;
+# the "_left" frames are mirrored from them the first time they are looked up.
+class MirroredSheet(dict):
+    def __init__(self, sprites, mirror):
+        super().__init__(sprites)
+        self.mirror = mirror  # Function turning a list of "_right" frames into the "_left" ones
+
+    def __missing__(self, name):
+        right = name[:-len("_left")] + "_right"
+        if not name.endswith("_left") or right not in self:
+            raise KeyError(name)
+        frames = self[name] = self.mirror(self[right])
+        return frames
+
+# Collision masks by animation name, built from a sheet's frames the first time they are looked up.
+# Native-size frames are scaled up first, so the masks match the world-size frames exactly.
+class SheetMasks(dict):
+    def __init__(self, sprites, masks=(), native=False):
+        super().__init__(masks)
+        self.sprites = sprites
+        self.native = native
+
+    def __missing__(self, name):
+        masks = self[name] = [TEXTURE_ATLAS.mask(frame, self.native)  # One mask per distinct frame
+                              for frame in self.sprites[name]]
+        return masks
+
+# Function to build the collision mask of every frame, keyed like the frames
+def build_masks(sprites):
+    return {name: [pygame.mask.from_surface(sprite) for sprite in frames] for name, frames in sprites.items()}
+
+# Function to move a sheet's frames into the texture atlas, keeping them grouped by animation
+def pack_sheet(sprites):
+    frames = TEXTURE_ATLAS.pack([frame for animation in sprites.values() for frame in animation])
+    packed = {}
+    for name, animation in sprites.items():
+        packed[name], frames = frames[:len(animation)], frames[len(animation):]
+    return packed
+
+# Function to hand a sheet's frames back to the texture atlas
+def release_sheet(sprites):
+    TEXTURE_ATLAS.release([frame for animation in sprites.values() for frame in animation])
+
+# Process-wide cache of sliced sprite sheets shared by every object that loads the same sheet
+class SpriteCache:
+    def __init__(self):
+        self.sheets = {}  # (dir1, dir2, width, height, direction) -> frames by animation name
+        self.masks = {}  # Same key -> collision masks by animation name, parallel to the frames
+        self.hits = 0  # Lookups answered from the cache
+        self.misses = 0  # Lookups that had to read and slice the sheet
+        self.used = None  # Keys requested since track_usage(), or None when not tracking
+        self.native = False  # Keep frames at the art's size, for drawing to a half-size back buffer
+
+    # Get the frames for a sheet, from the prebuilt archive or by slicing it from disk, only the first time.
+    # Directional sheets mirror their "_left" frames on first use, and masks are built on first use.
+    def get(self, dir1, dir2, width, height, direction=False):
+        key = (dir1, dir2, width, height, direction)
+        if self.used is not None:
+            self.used.add(key)
+        sprites = self.sheets.get(key)
+        if sprites is None:
+            self.misses += 1
+            archived = None if self.native else SPRITE_ARCHIVE.sheet(key)  # The archive holds world-size frames
+            if archived is None:
+                sprites = pack_sheet(slice_sprite_sheets(dir1, dir2, width, height, direction, self.native))
+                masks = {}
+            else:
+                sprites, masks = archived
+            if direction:
+                sprites = MirroredSheet(sprites, self.mirror)
+            self.sheets[key] = sprites
+            self.masks[key] = SheetMasks(sprites, masks, self.native)
+        else:
+            self.hits += 1
+        return sprites
+
+    # Flip a directional sheet's "_right" frames into the atlas when its "_left" frames are first needed
+    def mirror(self, frames):
+        return TEXTURE_ATLAS.pack(flip(frames))
+
+    # Get the precomputed masks for a sheet, indexed like the frames returned by get()
+    def get_masks(self, dir1, dir2, width, height, direction=False):
+        key = (dir1, dir2, width, height, direction)
+        if key not in self.masks:
+            self.get(dir1, dir2, width, height, direction)
+        return self.masks[key]
+
+    # Drop cached sheets (all of them, or only those under dir1/dir2) e.g. between levels
+    def purge(self, dir1=None, dir2=None):
+        for key in list(self.sheets):
+            if (dir1 is None or key[0] == dir1) and (dir2 is None or key[1] == dir2):
+                release_sheet(self.sheets.pop(key))
+                del self.masks[key]
+
+    # Start recording which sheets are requested, e.g. while the next level is built
+    def track_usage(self):
+        self.used = set()
+
+    # Drop every sheet not requested since track_usage(); sheets the new level shares stay loaded
+    def release_unused(self):
+        if self.used is None:
+            return
+        for key in list(self.sheets):
+            if key not in self.used:
+                release_sheet(self.sheets.pop(key))
+                del self.masks[key]
+        self.used = None
+
+    # Reset the hit/miss counters
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    # Report cache counters for debugging and benchmarks. "mirrored" counts the "_left" frames built so far,
+    # out of the "mirrorable" ones every loaded directional sheet could make.
+    def stats(self):
+        mirrored = mirrorable = 0
+        for sprites in self.sheets.values():
+            if isinstance(sprites, MirroredSheet):
+                for name, frames in sprites.items():
+                    if name.endswith("_left"):
+                        mirrored += len(frames)
+                    elif name.endswith("_right"):
+                        mirrorable += len(frames)
+        return {"hits": self.hits, "misses": self.misses, "sheets": len(self.sheets),
+                "mirrored": mirrored, "mirrorable": mirrorable}
+
+
+SPRITE_CACHE = SpriteCache()
+
+# Function to load sprite sheets from the assets folder (shared through SPRITE_CACHE)
+def load_sprite_sheets(dir1, dir2, width, height, direction=False):
+    return SPRITE_CACHE.get(dir1, dir2, width, height, direction)
+
+# Function to get the per-frame collision masks matching load_sprite_sheets
+def load_sprite_masks(dir1, dir2, width, height, direction=False):
+    return SPRITE_CACHE.get_masks(dir1, dir2, width, height, direction)
+
+# Terrain tile atlas: Terrain.png is read once and every material is built once
+class TerrainAtlas:
+    def __init__(self, path=join("assets", "Terrain", "Terrain.png")):
+        self.path = path
+        self.sheet = None  # Terrain sprite sheet, loaded on first use
+        self.blocks = {}  # (size, sprite_x, sprite_y) -> scaled block image
+        self.tiles = {}  # (size, sprite_x, sprite_y) -> (tile image, tile mask)
+        self.used = None  # Materials requested since track_usage(), or None when not tracking
+        self.native = False  # Keep blocks and tiles at the art's size, like SpriteCache.native
+
+    # Load the terrain sprite sheet the first time it is needed
+    def get_sheet(self):
+        if self.sheet is None:
+            self.sheet = load_image(self.path)
+        return self.sheet
+
+    # Get the scaled block image for a material
+    def get_block(self, size, sprite_x=96, sprite_y=0):
+        key = (size, sprite_x, sprite_y)
+        block = self.blocks.get(key)
+        if block is None:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA, 32)
+            rect = pygame.Rect(sprite_x, sprite_y, size, size)  # Use sprite_x and sprite_y for block coordinates
+            surface.blit(self.get_sheet(), (0, 0), rect)
+            if not self.native:
+                surface = pygame.transform.scale2x(surface)  # Scale up the block
+            block = self.blocks[key] = TEXTURE_ATLAS.add(surface)
+        return block
+
+    # Get the shared size x size tile image and collision mask for a material
+    def get_tile(self, size, sprite_x=96, sprite_y=0):
+        key = (size, sprite_x, sprite_y)
+        if self.used is not None:
+            self.used.add(key)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = None if self.native else SPRITE_ARCHIVE.tile(key)  # The archive holds world-size tiles
+            if tile is None:
+                tile = self.build_tile(size, sprite_x, sprite_y)
+            self.tiles[key] = tile
+        return tile
+
+    # Cut a tile image out of the terrain sheet and build its mask. The mask is always world size,
+    # cut from the scaled-up block, and native tiles are cut from the unscaled block.
+    def build_tile(self, size, sprite_x=96, sprite_y=0):
+        block = self.get_block(size, sprite_x, sprite_y)
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        image.blit(pygame.transform.scale2x(block) if self.native else block, (0, 0))
+        mask = pygame.mask.from_surface(image)
+        if self.native:
+            image = pygame.Surface((size // WORLD_SCALE, size // WORLD_SCALE), pygame.SRCALPHA)
+            image.blit(block, (0, 0))
+        return TEXTURE_ATLAS.add(image), mask
+
+    # Start recording which materials are requested
+    def track_usage(self):
+        self.used = set()
+
+    # Drop the materials not requested since track_usage(); the sheet itself stays loaded
+    def release_unused(self):
+        if self.used is None:
+            return
+        for key in [key for key in self.blocks if key not in self.used]:
+            TEXTURE_ATLAS.release([self.blocks.pop(key)])
+        for key in [key for key in self.tiles if key not in self.used]:
+            TEXTURE_ATLAS.release([self.tiles.pop(key)[0]])
+        self.used = None
+
+    # Drop the sheet and every built material
+    def purge(self):
+        self.sheet = None
+        TEXTURE_ATLAS.release(list(self.blocks.values()) + [image for image, _ in self.tiles.values()])
+        self.blocks.clear()
+        self.tiles.clear()
+
+
+TERRAIN_ATLAS = TerrainAtlas()
+
+# Function to get a block image for terrain (shared through TERRAIN_ATLAS)
+def get_block(size, sprite_x=96, sprite_y=0):
+    return TERRAIN_ATLAS.get_block(size, sprite_x, sprite_y)
+
+# Function to switch the caches between world-size frames and native (art-size) ones.
+# Frames already loaded at the other size are dropped.
+def set_native_resolution(native):
+    for cache in (SPRITE_CACHE, TERRAIN_ATLAS):
+        if cache.native != native:
+            cache.purge()
+            cache.native = native
+
+# Function to get the size of an image that covers width x height world pixels, at the current frame size
+def image_size(width, height):
+    if SPRITE_CACHE.native:
+        return width // WORLD_SCALE, height // WORLD_SCALE
+    return width, height
@@ -0,0 +1,27 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Levels and assets are loaded from paths relative to the repo root
+
+import pytest
+import game
+from world import LEFT, RIGHT
+
+# Holding a direction against a wall must leave the player standing still next to it, not bouncing
+# in and out of the wall's bounding box on alternate ticks
+@pytest.mark.parametrize("level, buttons", [(2, RIGHT), (2, LEFT), (1, LEFT)])
+def test_holding_into_wall_stays_put(level, buttons):
+    world = game.build_world(level, render=False)
+    player = world.player
+    for _ in range(30):  # Walk into the wall and settle
+        world.step(buttons)
+
+    x = player.rect.x
+    for _ in range(120):
+        world.step(buttons)
+        assert player.rect.x == x
+        assert player.x_vel == 0  # Blocked every tick, so the run animation does not flicker on
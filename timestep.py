@@ -0,0 +1,59 @@
+import time
+
+# Accumulator-based fixed timestep: simulation ticks run at a fixed rate, independent of the render rate
+class FixedTimestep:
+    def __init__(self, rate, max_ticks=5, clock=time.perf_counter):
+        self.dt = 1 / rate  # Seconds of game time per tick
+        self.max_ticks = max_ticks  # Most ticks per frame; beyond that time is dropped so a slow frame can't snowball
+        self.clock = clock
+        self.accumulator = 0.0  # Real time not yet simulated
+        self.last = None
+        self.alpha = 0.0  # How far the current frame is between the last two ticks (0..1)
+
+    # Get how many ticks are due since the last frame
+    def advance(self):
+        now = self.clock()
+        if self.last is None:
+            self.accumulator = self.dt  # Always simulate one tick before the first frame
+        else:
+            self.accumulator += now - self.last
+        self.last = now
+
+        ticks = min(int(self.accumulator / self.dt), self.max_ticks)
+        self.accumulator -= ticks * self.dt
+        if ticks == self.max_ticks:
+            self.accumulator = min(self.accumulator, self.dt)  # Drop the backlog on very slow frames
+        self.alpha = self.accumulator / self.dt
+        return ticks
+
+    # Blend a value between its previous and current tick for the current frame
+    def lerp(self, previous, current):
+        return previous + (current - previous) * self.alpha
+
+# Remembers where objects were before the latest tick so frames can be drawn between ticks
+class Interpolator:
+    def __init__(self, objects):
+        self.objects = objects
+        self.previous = {}  # object -> rect position before the latest tick
+        self.current = {}  # object -> simulated rect position, while an interpolated position is applied
+
+    # Record positions at the start of a tick
+    def snapshot(self):
+        self.previous = {obj: obj.rect.topleft for obj in self.objects}
+
+    # Move objects to their positions at alpha between the last two ticks (call restore() after drawing)
+    def apply(self, alpha):
+        self.current = {}
+        for obj in self.objects:
+            previous = self.previous.get(obj)
+            if previous is None:
+                continue
+            x, y = self.current[obj] = obj.rect.topleft
+            obj.rect.topleft = (round(previous[0] + (x - previous[0]) * alpha),
+                                round(previous[1] + (y - previous[1]) * alpha))
+
+    # Put objects back at their simulated positions
+    def restore(self):
+        for obj, position in self.current.items():
+            obj.rect.topleft = position
+        self.current = {}
@@ -0,0 +1,201 @@
+import pygame
+from collision import SpatialHash, TileGrid, merge_static_blocks, push_out, sweep_move
+from render import StaticLayer, visible_objects
+from hud import get_bitmap_font
+from profiler import PROFILER
+
+# Input bits for one simulation tick
+LEFT = 1  # Left arrow held
+RIGHT = 2  # Right arrow held
+JUMP = 4  # Jump pressed this tick
+
+BASE_TICK_RATE = 60  # Ticks per second that speeds, gravity and animation delays are given for
+
+# Function to read the held movement keys as input bits
+def read_keys():
+    keys = pygame.key.get_pressed()  # Get the currently pressed keys
+    return (LEFT if keys[pygame.K_LEFT] else 0) | (RIGHT if keys[pygame.K_RIGHT] else 0)
+
+# One running level: the player, its objects, and the indexes used to simulate and draw them.
+# The windowed game and headless runs both drive it one tick at a time through step().
+# With a render_scale above 1, sprites are expected at 1/render_scale of their world size: the scene is
+# drawn on a back buffer that much smaller than the view and scaled up to the window in one go.
+class World:
+    def __init__(self, player, objects, static_objects, block_size, fps, player_vel, hazards,
+                 view_size, offset_x, scroll_area_width=200, render=True, render_scale=1):
+        self.player = player
+        self.objects = objects
+        self.fps = fps  # Simulation ticks per second
+        self.tick_scale = BASE_TICK_RATE / fps  # Base-rate ticks each tick stands for
+        self.player_vel = player_vel  # Player movement speed, in pixels per base-rate tick
+        self.hazards = hazards  # Names of objects that hurt the player
+        self.view_width, self.view_height = view_size
+        self.offset_x = offset_x  # Camera offset
+        self.scroll_area_width = scroll_area_width
+        self.render_scale = render_scale  # World pixels per drawn pixel
+        self.ticks = 0
+        self.carry_x = 0  # Fraction of a pixel the player's last horizontal step left over
+        self.moved_x = 0  # Pixels the player moved along x in the last tick
+        self.completed = False  # Set once the player touches the level end block
+
+        # Compile grid-aligned static objects into a tile map; off-grid ones and everything that
+        # moves go through the spatial hash instead. Both merge runs of blocks into large
+        # colliders, while the blocks themselves stay in objects for drawing.
+        self.tile_grid, off_grid = TileGrid.compile(static_objects, block_size)
+        static_ids = {id(obj) for obj in static_objects}
+        self.dynamic_objects = [obj for obj in objects if id(obj) not in static_ids]
+        self.dynamic_set = set(self.dynamic_objects)
+        self.spatial_hash = SpatialHash(block_size)
+        self.spatial_hash.insert_all(merge_static_blocks(off_grid, block_size) + self.dynamic_objects)
+
+        # Bake the static objects into chunk surfaces once; only moving objects are drawn one by one,
+        # through an index so draw() only visits what the camera can see. Headless runs skip this.
+        self.static_layer = None
+        self.render_hash = None
+        self.back_buffer = None
+        if render:
+            self.static_layer = StaticLayer(static_objects, scale=render_scale)
+            self.render_hash = SpatialHash(block_size * 4)
+            self.render_hash.insert_all(self.dynamic_objects)
+            if render_scale > 1:
+                self.back_buffer = pygame.Surface((self.view_width // render_scale,
+                                                   self.view_height // render_scale)).convert()
+
+    # Advance the simulation by one tick with the given input bits
+    def step(self, buttons):
+        player = self.player
+        if buttons & JUMP and player.jump_count < 2:  # Allow double jumping
+            player.jump()
+
+        player.loop(self.fps)  # Update the player
+        PROFILER.mark("player")
+        for obj in self.dynamic_objects:
+            obj.loop(self.fps)  # Animate and move traps and platforms
+            self.spatial_hash.update(obj)  # Re-bucket objects that moved this tick
+            if self.render_hash is not None:
+                self.render_hash.update(obj)
+        PROFILER.mark("traps")
+
+        self.handle_move(buttons)  # Handle player movement and collisions
+
+        # Handle screen scrolling based on player position
+        if ((player.rect.right - self.offset_x >= self.view_width - self.scroll_area_width) and player.x_vel > 0) or (
+                (player.rect.left - self.offset_x <= self.scroll_area_width) and player.x_vel < 0):
+            self.offset_x += self.moved_x
+
+        self.ticks += 1
+        PROFILER.mark("collision")
+
+    # Handle player movement and resolve collisions in a single swept pass
+    def handle_move(self, buttons):
+        player = self.player
+        player.x_vel = 0  # Reset horizontal velocity
+        if buttons & LEFT:
+            player.move_left(self.player_vel)
+        if buttons & RIGHT:
+            player.move_right(self.player_vel)
+
+        # A level may place the player partly inside terrain, and the sweep only stops at what it moves
+        # into, so push it out once on the first tick (its mask exists from then on)
+        contacts = []
+        if self.ticks == 0:
+            terrain = self.tile_grid.query(player.rect) + [obj for obj in self.spatial_hash.query(player.rect)
+                                                           if obj not in self.dynamic_set]
+            contacts = push_out(player, terrain)
+
+        # Velocities are in pixels per base-rate tick. At other rates the player's horizontal speed leaves
+        # a fraction of a pixel each tick, carried over so it keeps its speed; fall speeds are fractional
+        # anyway and round as they always have.
+        dx = player.x_vel * self.tick_scale + self.carry_x if player.x_vel else 0
+        self.carry_x = dx - int(dx)
+        start_x = player.rect.x
+
+        # Sweep the player along x then y and react to what it touched
+        contacts += sweep_move(player, self.spatial_hash, int(dx), player.y_vel * self.tick_scale, self.tile_grid)
+        self.moved_x = player.rect.x - start_x
+        normals = {normal for _, normal in contacts}
+        if (-1, 0) in normals or (1, 0) in normals:
+            player.x_vel = 0  # Blocked by a wall
+            self.carry_x = 0
+        if (0, -1) in normals:
+            player.landed()  # Standing on the ground
+        elif (0, 1) in normals:
+            player.hit_head()  # Bumped into a ceiling
+
+        hurt = False
+        for obj, _ in contacts:
+            if obj.name in self.hazards:
+                hurt = True
+            elif obj.name == "level_end":
+                self.completed = True
+
+        # Traps also move into a player that did not move into them, which the sweep cannot see,
+        # so check what the player overlaps once it has moved
+        for obj in self.spatial_hash.query(player.rect):
+            if obj.name in self.hazards and pygame.sprite.collide_mask(player, obj):
+                hurt = True
+
+        if hurt:
+            player.take_damage()  # Decrease health once, however many traps the player touches
+
+    # Draw the background, terrain, moving objects and player on a surface render_scale times smaller than the view
+    def draw_scene(self, surface, background, offset_x, visible):
+        scale = self.render_scale
+        camera_x = offset_x // scale  # Scaled once, so everything shifts by the same whole pixel count
+
+        # Draw the background
+        background.draw(surface, camera_x)
+
+        # Draw the pre-baked terrain, then the moving objects on top in one blits() call (every object
+        # draws its image at its rect, as Object.draw does)
+        self.static_layer.draw(surface, camera_x)
+        surface.blits([(obj.image, (obj.rect.x // scale - camera_x, obj.rect.y // scale)) for obj in visible],
+                      doreturn=False)
+
+        # Draw the player
+        self.player.draw(surface, camera_x, scale)
+
+    # Function to draw everything on the screen; overlay (e.g. the profiler's) is drawn last
+    def draw(self, window, background, offset_x, dirty_rects=None, overlay=None):
+        player = self.player
+        visible = visible_objects(self.render_hash, offset_x, self.view_width, self.view_height)  # Moving objects inside the camera view
+
+        # Health is drawn with the bitmap font: a few glyph blits, no text rasterisation
+        hud_font = get_bitmap_font("White", 3)
+        health_text = f'Health: {player.health}'
+
+        # Work out which parts of the screen to repaint: everything, unless in dirty-rectangle mode
+        # (which needs the scene drawn straight to the window)
+        if dirty_rects is None or self.back_buffer is not None:
+            regions = [window.get_rect()]
+        else:
+            for obj in (*visible, player):
+                dirty_rects.mark(obj.rect.move(-offset_x, 0))
+            dirty_rects.mark(hud_font.get_rect(health_text, (10, 10)))
+            if overlay is not None and PROFILER.enabled:
+                dirty_rects.mark(overlay.rect)
+            regions = dirty_rects.regions(offset_x)
+
+        for region in regions:
+            window.set_clip(region)  # Keep every blit below inside the region
+
+            if self.back_buffer is None:
+                self.draw_scene(window, background, offset_x, visible)
+            else:
+                self.draw_scene(self.back_buffer, background, offset_x, visible)
+                pygame.transform.scale(self.back_buffer, window.get_size(), window)  # Nearest-neighbour upscale
+
+            # Display player health, at full resolution on top of the scene
+            hud_font.draw(window, health_text, (10, 10))  # Display in the top-left corner
+
+            if overlay is not None:
+                overlay.draw(window)
+        window.set_clip(None)
+        PROFILER.mark("draw")
+
+        # Update the display (only the repainted regions in dirty-rectangle mode)
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(regions)
+        PROFILER.mark("display")